@@ -1,11 +1,13 @@
-from forms import RegistrationForm, LoginForm, LinkLeagueForm, ContestForm, DeleteLeagueForm
+from forms import RegistrationForm, LoginForm, LinkLeagueForm, ContestForm, DeleteLeagueForm, STAT_CATEGORY_CHOICES
+from stats_core import index_game_log, CATEGORY_TO_MLB_KEYS, STAT_PARSERS, ROW_CHECKS, RATIO_FORMULAS, reduce_team_totals, team_values
 from flask import Flask, render_template, request, redirect, url_for, flash, send_file
 from flask_sqlalchemy import SQLAlchemy
+from flask_wtf.csrf import generate_csrf
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, date, timezone
 import requests
-import json
+import orjson
 import urllib.parse
 import os
 from dotenv import load_dotenv
@@ -16,15 +18,23 @@ from cryptography.fernet import Fernet, InvalidToken
 import base64
 from collections import defaultdict
 import requests.exceptions
-from sqlalchemy.exc import OperationalError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import insert, func
+from sqlalchemy.exc import OperationalError, IntegrityError
 from time import sleep
 from playwright.sync_api import sync_playwright
 import io
-import tempfile
+import threading
+import uuid
+from functools import lru_cache
 
 # Load environment variables
 load_dotenv()
 YEAR = int(os.getenv('YEAR', datetime.now().year))
+SEASON_START = date(YEAR, 3, 18)
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY')
 if not app.secret_key:
@@ -48,20 +58,33 @@ else:
         with open(key_path, 'wb') as f:
             f.write(encryption_key)
 ENCRYPTION_KEY = base64.urlsafe_b64encode(encryption_key)
+_FERNET = Fernet(ENCRYPTION_KEY)
+
+@lru_cache(maxsize=512)
+def _fernet_decrypt(token):
+    # Keyed by ciphertext, so a re-encrypted or rotated cookie simply misses the cache
+    return _FERNET.decrypt(token).decode()
 
 # Configure database
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', f'sqlite:///{os.path.join(app.instance_path, "database.db")}')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_size': 5,
-    'max_overflow': 10,
-    'pool_timeout': 30,
-    'pool_recycle': 1800,
-    'pool_pre_ping': True
-}
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    # SQLite connections are local files; leave pooling to SQLAlchemy's defaults
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True}
+else:
+    # Sized for concurrent ESPN/MLB fetches alongside request traffic; fail fast instead of queueing for 30s
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 20,
+        'max_overflow': 30,
+        'pool_timeout': 10,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True
+    }
 app.config['SESSION_COOKIE_SECURE'] = True
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+# Also save a full-page debug_full_page.png with every snapshot
+app.config['SCREENSHOT_DEBUG'] = os.getenv('SCREENSHOT_DEBUG', '').lower() in ('1', 'true', 'yes')
 db = SQLAlchemy(app)
 
 # Configure Flask-Caching
@@ -71,16 +94,17 @@ app.config['CACHE_DEFAULT_TIMEOUT'] = 86400
 cache = Cache(app)
 
 # Logging setup
-logging.basicConfig(level=logging.DEBUG)
-HEADERS = {'Connection': 'Keeping-alive', 'Accept': 'application/json', 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+HEADERS = {'Connection': 'keep-alive', 'Accept': 'application/json', 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
 MLB_BASE_URL = "https://statsapi.mlb.com/api/v1"
 
-# Caches
-mlb_id_cache = {}
-game_log_cache = {}
-processed_players = set()
-team_names_cache = {}
-roster_cache = {}
+# Shared HTTP session so concurrent fetches reuse pooled connections
+http_session = requests.Session()
+adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]))
+http_session.mount('http://', adapter)
+http_session.mount('https://', adapter)
+# It is shared across users, so its jar must not keep ESPN's Set-Cookie responses; each request passes that user's cookies itself
+http_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
 
 # Manual mappings
 manual_mlb_mappings = {
@@ -114,21 +138,17 @@ class League(db.Model):
 
     @property
     def espn_s2_decrypted(self):
-        cipher = Fernet(ENCRYPTION_KEY)
-        return cipher.decrypt(self.espn_s2.encode()).decode()
+        return _fernet_decrypt(self.espn_s2.encode())
 
     def set_espn_s2(self, value):
-        cipher = Fernet(ENCRYPTION_KEY)
-        self.espn_s2 = cipher.encrypt(value.encode()).decode()
+        self.espn_s2 = _FERNET.encrypt(value.encode()).decode()
 
     @property
     def swid_decrypted(self):
-        cipher = Fernet(ENCRYPTION_KEY)
-        return cipher.decrypt(self.swid.encode()).decode()
+        return _fernet_decrypt(self.swid.encode())
 
     def set_swid(self, value):
-        cipher = Fernet(ENCRYPTION_KEY)
-        self.swid = cipher.encrypt(value.encode()).decode()
+        self.swid = _FERNET.encrypt(value.encode()).decode()
 
 class Contest(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -149,6 +169,7 @@ class ContestResult(db.Model):
     warning_message = db.Column(db.Text, nullable=True)
     status = db.Column(db.Text, nullable=False)
     last_updated = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    __table_args__ = (db.Index('ix_contestresult_contest_updated', 'contest_id', 'last_updated'),)
 
 class PlayerCache(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -159,6 +180,7 @@ class PlayerCache(db.Model):
     season = db.Column(db.Integer, nullable=False)
     group = db.Column(db.String(20), nullable=False)
     last_updated = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    __table_args__ = (db.Index('ix_playercache_espn_season_group', 'espn_id', 'season', 'group'),)
 
 # Initialize database with retries
 def init_db_with_retries(max_attempts=3, delay=5):
@@ -171,7 +193,7 @@ def init_db_with_retries(max_attempts=3, delay=5):
             return
         except OperationalError as e:
             attempts += 1
-            logging.error(f"Database initialization attempt {attempts} failed: {str(e)}")
+            logging.error("Database initialization attempt %s failed: %s", attempts, e)
             if attempts < max_attempts:
                 sleep(delay)
             else:
@@ -179,6 +201,22 @@ def init_db_with_retries(max_attempts=3, delay=5):
                 raise
 init_db_with_retries()
 
+def commit_with_retry(stage, description, max_attempts=3, base_delay=0.1, retry_on=(OperationalError,)):
+    # stage() re-applies the changes on each attempt, since the rollback after a failed commit discards them; returns what stage() returns
+    attempts = 0
+    while True:
+        try:
+            result = stage()
+            db.session.commit()
+            return result
+        except retry_on as e:
+            attempts += 1
+            logging.error("Error during %s attempt %s: %s", description, attempts, e)
+            db.session.rollback()
+            if attempts >= max_attempts:
+                raise
+            sleep(base_delay * 2 ** (attempts - 1))
+
 # Flask-Login setup
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -186,92 +224,77 @@ login_manager.login_view = 'login'
 
 @login_manager.user_loader
 def load_user(user_id):
-    max_attempts = 3
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            return db.session.get(User, int(user_id))
-        except OperationalError as e:
-            attempts += 1
-            logging.error(f"Database error in load_user attempt {attempts}: {str(e)}")
-            if attempts < max_attempts:
-                sleep(2)
-            db.session.rollback()
-    return None
-
-@cache.memoize(timeout=86400)
-def get_mlb_id(player_name, player_id):
-    logging.debug(f"Fetching MLB ID for player {player_name} (ESPN ID: {player_id})")
-    if not player_name:
+    try:
+        return db.session.get(User, int(user_id))
+    except (OperationalError, ValueError) as e:
+        logging.error("Error loading user %s: %s", user_id, e)
+        db.session.rollback()
         return None
-    if player_id in manual_mlb_mappings:
-        logging.debug(f"Using manual mapping for player ID {player_id}: {manual_mlb_mappings[player_id]}")
-        return manual_mlb_mappings[player_id]
-
-    # Check database cache
-    player_cache = PlayerCache.query.filter_by(espn_id=player_id, season=YEAR).first()
-    if player_cache and player_cache.mlb_id:
-        logging.debug(f"Database cache hit for MLB ID: {player_cache.mlb_id}")
-        return player_cache.mlb_id
 
-    # Fetch from API
+def fetch_mlb_id(player_name):
     encoded_name = urllib.parse.quote(player_name)
     search_url = f"{MLB_BASE_URL}/people/search?names={encoded_name}&sportId=1&active=true"
-    try:
-        response = requests.get(search_url, timeout=5)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        logging.debug(f"MLB API error for player {player_name} (ID: {player_id}): {str(e)}")
-        return None
+    response = http_session.get(search_url, timeout=5)
+    response.raise_for_status()
     data = response.json()
-    logging.debug(f"Found {len(data.get('people', []))} active player matches for {player_name}")
+    logging.debug("Found %s active player matches for %s", len(data.get('people', [])), player_name)
     if data['people']:
-        mlb_id = data['people'][0]['id']
-        # Store in database
-        max_attempts = 3
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                player_cache = PlayerCache.query.filter_by(espn_id=player_id, season=YEAR).first()
-                if player_cache:
-                    player_cache.mlb_id = mlb_id
-                    player_cache.last_updated = datetime.now(timezone.utc)
-                else:
-                    player_cache = PlayerCache(
-                        espn_id=player_id,
-                        player_name=player_name,
-                        mlb_id=mlb_id,
-                        season=YEAR,
-                        group='hitting'
-                    )
-                    db.session.add(player_cache)
-                db.session.commit()
-                logging.debug(f"Stored MLB ID {mlb_id} for player {player_name}")
-                return mlb_id
-            except OperationalError as e:
-                attempts += 1
-                logging.error(f"Database error storing MLB ID for {player_name}, attempt {attempts}: {str(e)}")
-                db.session.rollback()
-                if attempts < max_attempts:
-                    sleep(2)
-        logging.debug(f"Failed to store MLB ID for {player_name} after {max_attempts} attempts")
-        return mlb_id
-    logging.debug(f"No MLB ID found for player {player_name} (ESPN ID: {player_id})")
+        return data['people'][0]['id']
     return None
 
+def get_mlb_ids(players, group):
+    # players maps ESPN ID -> name; returns ESPN ID -> MLB ID for every player that could be resolved
+    logging.debug("Resolving MLB IDs for %s players", len(players))
+    mlb_ids = {player_id: manual_mlb_mappings[player_id] for player_id in players if player_id in manual_mlb_mappings}
+
+    # Check database cache
+    lookup_ids = [player_id for player_id in players if player_id not in mlb_ids]
+    if lookup_ids:
+        cached_ids = db.session.query(PlayerCache.espn_id, PlayerCache.mlb_id).filter(PlayerCache.espn_id.in_(lookup_ids), PlayerCache.season == YEAR, PlayerCache.mlb_id.isnot(None)).all()
+        mlb_ids.update({espn_id: mlb_id for espn_id, mlb_id in cached_ids})
+        logging.debug("Database cache hit for %s MLB IDs", len(cached_ids))
+
+    # Fetch the rest from the API concurrently
+    missing = {player_id: players[player_id] for player_id in lookup_ids if player_id not in mlb_ids}
+    if not missing:
+        return mlb_ids
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = {executor.submit(fetch_mlb_id, player_name): player_id for player_id, player_name in missing.items()}
+        for future in as_completed(futures):
+            player_id = futures[future]
+            try:
+                mlb_id = future.result()
+            except requests.exceptions.RequestException as e:
+                logging.debug("MLB API error for player %s (ID: %s): %s", missing[player_id], player_id, e)
+                continue
+            if mlb_id:
+                fetched[player_id] = mlb_id
+            else:
+                logging.warning("No MLB ID for player %s (ESPN ID: %s)", missing[player_id], player_id)
+    mlb_ids.update(fetched)
+
+    # Store in database; a player's existing row is found by espn_id whatever its season, and IntegrityError means a
+    # contest computed in parallel inserted the player first, which the retry's lookup then finds
+    if fetched:
+        rows = {player_id: (missing[player_id], mlb_id, None) for player_id, mlb_id in fetched.items()}
+        try:
+            commit_with_retry(lambda: stage_player_caches(rows, group), "MLB ID storage", retry_on=(OperationalError, IntegrityError))
+            logging.debug("Stored %s MLB IDs", len(fetched))
+        except (OperationalError, IntegrityError) as e:
+            logging.error("Failed to store %s MLB IDs: %s", len(fetched), e)
+    return mlb_ids
+
 @cache.memoize(timeout=86400)
 def get_team_names(league_id, cookies):
-    logging.debug(f"Fetching team names for league {league_id}")
-    if league_id in team_names_cache:
-        logging.debug(f"Cache hit for team names for league {league_id}")
-        return team_names_cache[league_id]
+    logging.debug("Fetching team names for league %s", league_id)
     base_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/flb/seasons/{YEAR}/segments/0/leagues/{league_id}"
     teams_url = f"{base_url}?view=mTeam"
     try:
-        response = requests.get(teams_url, headers=HEADERS, cookies=cookies, timeout=5)
+        response = http_session.get(teams_url, headers=HEADERS, cookies=cookies, timeout=5)
         response.raise_for_status()
     except requests.RequestException as e:
-        logging.error(f"API error fetching teams for league {league_id}: {str(e)}")
+        logging.error("API error fetching teams for league %s: %s", league_id, e)
         raise ValueError(f"API error fetching teams: {str(e)}")
     teams_data = response.json()['teams']
     logging.debug("[TEAM_DATA] Raw team data: %s", teams_data)
@@ -284,564 +307,570 @@ def get_team_names(league_id, cookies):
             location = t.get('location', '')
             nickname = t.get('nickname', '')
             team_names[team_id] = f"{location} {nickname}".strip() or f"Team {team_id}"
-        logging.debug(f"[TEAM_DATA] Team ID {team_id}: name={team_names[team_id]}")
-    team_names_cache[league_id] = team_names
-    logging.debug(f"Stored team names for league {league_id}")
+        logging.debug("[TEAM_DATA] Team ID %s: name=%s", team_id, team_names[team_id])
     return team_names
 
-@cache.memoize(timeout=86400)
+# Rosters change with every lineup move, so they expire sooner than team names or contest stats
+@cache.memoize(timeout=3600)
 def get_team_rosters(league_id, cookies, start_date, end_date, season_start):
-    logging.debug(f"Fetching rosters for league {league_id} from {start_date} to {end_date}")
-    cache_key = f"rosters_{league_id}_{start_date}_{end_date}"
-    if cache_key in roster_cache:
-        logging.debug(f"Cache hit for rosters: {cache_key}")
-        return roster_cache[cache_key]
+    logging.debug("Fetching rosters for league %s from %s to %s", league_id, start_date, end_date)
 
-    rosters = {}
+    base_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/flb/seasons/{YEAR}/segments/0/leagues/{league_id}"
+    requests_by_date = []
     current = start_date
     while current <= end_date:
         scoring_period = (current - season_start).days + 1
-        base_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/flb/seasons/{YEAR}/segments/0/leagues/{league_id}"
-        roster_url = f"{base_url}?scoringPeriodId={scoring_period}&view=mRoster"
-        try:
-            response = requests.get(roster_url, headers=HEADERS, cookies=cookies, timeout=5)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logging.debug(f"API error fetching roster for date {current}: {str(e)}")
-            rosters[current] = []
-            current += timedelta(days=1)
-            continue
-        roster_data = response.json()['teams']
-        rosters[current] = roster_data
+        requests_by_date.append((current, f"{base_url}?scoringPeriodId={scoring_period}&view=mRoster"))
         current += timedelta(days=1)
 
-    roster_cache[cache_key] = rosters
-    logging.debug(f"Stored rosters for {cache_key}")
+    rosters = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(http_session.get, roster_url, headers=HEADERS, cookies=cookies, timeout=5): roster_date for roster_date, roster_url in requests_by_date}
+        for future in as_completed(futures):
+            roster_date = futures[future]
+            try:
+                response = future.result()
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logging.debug("API error fetching roster for date %s: %s", roster_date, e)
+                rosters[roster_date] = []
+                continue
+            rosters[roster_date] = response.json()['teams']
+
+    logging.debug("Fetched %s roster scoring periods for league %s", len(rosters), league_id)
     return rosters
 
-def parse_ip(ip):
-    try:
-        ip_str = str(ip)
-        if '.' not in ip_str:
-            return float(ip_str)
-        whole, frac = ip_str.split('.')
-        return float(whole) + float(frac) / 3
-    except Exception as e:
-        logging.warning(f"Error parsing innings pitched '{ip_str}': {str(e)}")
-        return 0.0
+def fetch_game_log(mlb_id, group):
+    game_log_url = f"{MLB_BASE_URL}/people/{mlb_id}/stats?stats=gameLog&season={YEAR}&group={group}"
+    response = http_session.get(game_log_url, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+def stage_player_caches(rows, group):
+    # rows maps ESPN ID -> (player_name, mlb_id, game_log or None). espn_id is unique, so a player has one row, found by espn_id
+    # alone and relabelled to this season and group; its old game log only survives if it was already for that season and group
+    existing = {player_cache.espn_id: player_cache for player_cache in PlayerCache.query.filter(PlayerCache.espn_id.in_(list(rows))).all()}
+    now = datetime.now(timezone.utc)
+    for player_id, (player_name, mlb_id, game_log) in rows.items():
+        encoded_log = orjson.dumps(game_log).decode() if game_log is not None else None
+        player_cache = existing.get(player_id)
+        if player_cache is None:
+            db.session.add(PlayerCache(espn_id=player_id, player_name=player_name, mlb_id=mlb_id, season=YEAR, group=group, game_log=encoded_log))
+            continue
+        if encoded_log is not None or player_cache.season != YEAR or player_cache.group != group:
+            player_cache.game_log = encoded_log
+        player_cache.season = YEAR
+        player_cache.group = group
+        player_cache.mlb_id = mlb_id
+        player_cache.last_updated = now
+
+VALID_STATS = frozenset(value for value, _ in STAT_CATEGORY_CHOICES)
 
 @cache.memoize(timeout=86400)
 def compute_contest_stats(contest_id):
-    logging.debug(f"Computing stats for contest {contest_id}")
-    max_attempts = 3
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            contest = db.session.get(Contest, contest_id)
-            if not contest:
-                logging.error(f"Contest {contest_id} not found")
-                raise ValueError("Contest not found.")
-            league = contest.league
-            if not league:
-                logging.error(f"League not found for contest {contest_id}")
-                raise ValueError("Linked league not found.")
-
-            stat_category = contest.stat_category.upper()
-            logging.debug(f"Using stat_category: {stat_category}")
-            valid_stats = ['OBP', 'HR', 'RBI', 'AVG', 'HITS', 'RUNS SCORED', 'WALKS', 'STOLEN BASES', 'SLUGGING PERCENTAGE', 'INNINGS PITCHED', 'HITS ALLOWED', 'ERA', 'WALKS ALLOWED', 'STRIKEOUTS', 'QUALITY STARTS', 'WINS', 'SAVES', 'SAVES + HOLDS', 'WHIP', 'K/BB']
-            if stat_category not in valid_stats:
-                logging.error(f"Invalid stat_category: {stat_category}")
-                raise ValueError(f"Invalid stat_category: {stat_category}. Choose from {', '.join(valid_stats)}.")
-
-            hitting_categories = ['OBP', 'HR', 'RBI', 'AVG', 'HITS', 'RUNS SCORED', 'WALKS', 'STOLEN BASES', 'SLUGGING PERCENTAGE']
-            pitching_categories = ['INNINGS PITCHED', 'HITS ALLOWED', 'ERA', 'WALKS ALLOWED', 'STRIKEOUTS', 'QUALITY STARTS', 'WINS', 'SAVES', 'SAVES + HOLDS', 'WHIP', 'K/BB']
+    logging.debug("Computing stats for contest %s", contest_id)
+    try:
+        contest = db.session.get(Contest, contest_id)
+        if not contest:
+            logging.error("Contest %s not found", contest_id)
+            raise ValueError("Contest not found.")
+        league = contest.league
+        if not league:
+            logging.error("League not found for contest %s", contest_id)
+            raise ValueError("Linked league not found.")
+
+        stat_category = contest.stat_category.upper()
+        logging.debug("Using stat_category: %s", stat_category)
+        if stat_category not in VALID_STATS:
+            logging.error("Invalid stat_category: %s", stat_category)
+            raise ValueError(f"Invalid stat_category: {stat_category}. Choose from {', '.join(value for value, _ in STAT_CATEGORY_CHOICES)}.")
+
+        mlb_keys = CATEGORY_TO_MLB_KEYS[stat_category]
+        hitting_categories = ['OBP', 'HR', 'RBI', 'AVG', 'HITS', 'RUNS SCORED', 'WALKS', 'STOLEN BASES', 'SLUGGING PERCENTAGE']
+        pitching_categories = ['INNINGS PITCHED', 'HITS ALLOWED', 'ERA', 'WALKS ALLOWED', 'STRIKEOUTS', 'QUALITY STARTS', 'WINS', 'SAVES', 'SAVES + HOLDS', 'WHIP', 'K/BB']
+        is_hitting_cat = stat_category in hitting_categories
+        is_pitching_cat = stat_category in pitching_categories
 
-            start_date = date.fromisoformat(contest.start_date)
-            end_date = date.fromisoformat(contest.end_date)
-            today = date.today()
-
-            status = {}
-            if start_date > today:
-                status['is_started'] = False
-                status['days_to_start'] = (start_date - today).days
-                status['days_remaining'] = None
-                status['is_complete'] = False
-                status['winner'] = None
-                rankings = []
-                chart_data = {"labels": [], "datasets": [{"label": stat_category, "data": [], "backgroundColor": [], "borderColor": [], "borderWidth": 1}]}
-                warning_message = "Contest not started yet."
-                logging.debug(f"Contest {contest_id} not started, returning empty results")
-                return rankings, chart_data, warning_message, status
-
-            effective_end = min(end_date, today)
-            no_data_days = []
-            all_star_break = [date(2025, 7, 14), date(2025, 7, 15), date(2025, 7, 16), date(2025, 7, 17)]
+        start_date = date.fromisoformat(contest.start_date)
+        end_date = date.fromisoformat(contest.end_date)
+        today = date.today()
+
+        status = {}
+        if start_date > today:
+            status['is_started'] = False
+            status['days_to_start'] = (start_date - today).days
+            status['days_remaining'] = None
+            status['is_complete'] = False
+            status['winner'] = None
+            rankings = []
+            chart_data = {"labels": [], "datasets": [{"label": stat_category, "data": [], "backgroundColor": [], "borderColor": [], "borderWidth": 1}]}
+            warning_message = "Contest not started yet."
+            logging.debug("Contest %s not started, returning empty results", contest_id)
+            return rankings, chart_data, warning_message, status
 
-            cookies = {'espn_s2': league.espn_s2_decrypted, 'swid': league.swid_decrypted}
-            team_names = get_team_names(league.espn_league_id, cookies)
+        effective_end = min(end_date, today)
+        # One flag per contest day, by offset from start_date; dates are only materialized for the warning
+        no_data_days = bytearray((effective_end - start_date).days + 1)
+        all_star_break = frozenset([date(2025, 7, 14), date(2025, 7, 15), date(2025, 7, 16), date(2025, 7, 17)])
 
-            team_stats = {team_name: {'num': 0.0, 'den': 0.0} if stat_category in ['OBP', 'AVG', 'SLUGGING PERCENTAGE', 'ERA', 'WHIP', 'K/BB'] else {'total': 0.0} for team_name in team_names.values()}
-            season_start = date(YEAR, 3, 18)
+        cookies = {'espn_s2': league.espn_s2_decrypted, 'swid': league.swid_decrypted}
+        team_names = get_team_names(league.espn_league_id, cookies)
 
-            try:
-                active_pitcher_slots = json.loads(league.active_pitcher_slots) if league.active_pitcher_slots else [13, 14, 15]
-                active_pitcher_slots = [slot for slot in active_pitcher_slots if slot in [13, 14, 15]]
-                if not active_pitcher_slots:
-                    logging.warning(f"No valid pitcher slots found for league {league.espn_league_id}, using default [13, 14, 15]")
-                    active_pitcher_slots = [13, 14, 15]
-            except json.JSONDecodeError:
-                logging.warning(f"Invalid active_pitcher_slots JSON for league {league.espn_league_id}, using default slots [13, 14, 15]")
+        # Accepted player-day rows, one column per MLB key: row_teams[r] is the team's position in team_ids, row_columns[k][r] is mlb_keys[k]
+        team_ids = list(team_names)
+        team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+        row_teams = []
+        row_columns = [[] for _ in mlb_keys]
+        column_appends = [(column.append, key) for column, key in zip(row_columns, mlb_keys)]
+        season_start = SEASON_START
+
+        try:
+            active_pitcher_slots = orjson.loads(league.active_pitcher_slots) if league.active_pitcher_slots else [13, 14, 15]
+            active_pitcher_slots = [slot for slot in active_pitcher_slots if slot in [13, 14, 15]]
+            if not active_pitcher_slots:
+                logging.warning("No valid pitcher slots found for league %s, using default [13, 14, 15]", league.espn_league_id)
                 active_pitcher_slots = [13, 14, 15]
-            logging.debug(f"Active pitcher slots for league {league.espn_league_id}: {active_pitcher_slots}")
-
-            # Test additions
-            is_june_hr_test = (stat_category == 'HR' and contest.start_date == '2025-06-01' and contest.end_date == '2025-06-30')
-            hr_per_day = defaultdict(list) if is_june_hr_test else None
-            is_march_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-03-18' and contest.end_date == '2025-03-31')
-            is_april_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-04-01' and contest.end_date == '2025-04-30')
-            is_may_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-05-01' and contest.end_date == '2025-05-31')
-            is_june_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-06-01' and contest.end_date == '2025-06-30')
-            is_july_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-07-01' and contest.end_date == '2025-07-31')
-            rbi_per_day = defaultdict(list) if is_march_rbi_test or is_april_rbi_test or is_may_rbi_test or is_june_rbi_test or is_july_rbi_test else None
-            is_july_ip_test = (stat_category == 'INNINGS PITCHED' and contest.start_date == '2025-07-01' and contest.end_date == '2025-07-31')
-            ip_per_day = defaultdict(list) if is_july_ip_test else None
-
-            # Process in weekly chunks
-            chunk_size = 7
-            current = start_date
-            while current <= effective_end:
-                chunk_end = min(current + timedelta(days=chunk_size - 1), effective_end)
-                logging.debug(f"Processing chunk from {current} to {chunk_end}")
-                rosters = get_team_rosters(league.espn_league_id, cookies, current, chunk_end, season_start)
-
-                chunk_date = current
-                while chunk_date <= chunk_end:
-                    date_str = chunk_date.strftime('%Y-%m-%d')
-                    logging.debug(f"Processing scoring period {(chunk_date - season_start).days + 1} for date {chunk_date}")
-                    processed_players.clear()
-
-                    roster_data = rosters.get(chunk_date, [])
-                    if not roster_data:
-                        if chunk_date not in all_star_break or stat_category not in pitching_categories:
-                            no_data_days.append(chunk_date)
-                        if is_july_ip_test:
-                            ip_per_day[date_str] = []
-                            logging.debug(f"No pitching stats for {date_str}, added empty IP entry for King Hoser")
-                        chunk_date += timedelta(days=1)
+        except orjson.JSONDecodeError:
+            logging.warning("Invalid active_pitcher_slots JSON for league %s, using default slots [13, 14, 15]", league.espn_league_id)
+            active_pitcher_slots = [13, 14, 15]
+        logging.debug("Active pitcher slots for league %s: %s", league.espn_league_id, active_pitcher_slots)
+
+        # Test additions
+        is_june_hr_test = (stat_category == 'HR' and contest.start_date == '2025-06-01' and contest.end_date == '2025-06-30')
+        hr_per_day = defaultdict(list) if is_june_hr_test else None
+        is_march_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-03-18' and contest.end_date == '2025-03-31')
+        is_april_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-04-01' and contest.end_date == '2025-04-30')
+        is_may_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-05-01' and contest.end_date == '2025-05-31')
+        is_june_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-06-01' and contest.end_date == '2025-06-30')
+        is_july_rbi_test = (stat_category == 'RBI' and contest.start_date == '2025-07-01' and contest.end_date == '2025-07-31')
+        is_rbi_test = is_march_rbi_test or is_april_rbi_test or is_may_rbi_test or is_june_rbi_test or is_july_rbi_test
+        rbi_per_day = defaultdict(list) if is_rbi_test else None
+        is_july_ip_test = (stat_category == 'INNINGS PITCHED' and contest.start_date == '2025-07-01' and contest.end_date == '2025-07-31')
+        ip_per_day = defaultdict(list) if is_july_ip_test else None
+        # Which daily value the active test records, and for which team
+        if is_june_hr_test:
+            test_key, test_team, test_log = 'homeRuns', "B. Hackenburg", hr_per_day
+        elif is_rbi_test:
+            test_key, test_team, test_log = 'rbi', "B. Hackenburg", rbi_per_day
+        elif is_july_ip_test:
+            test_key, test_team, test_log = 'inningsPitched', "King Hoser", ip_per_day
+        else:
+            test_key, test_team, test_log = None, None, None
+        row_check = ROW_CHECKS.get(stat_category)
+
+        # Fetch rosters for the whole contest range in one memoized call
+        rosters = get_team_rosters(league.espn_league_id, cookies, start_date, effective_end, season_start)
+
+        # Work out who started each day before touching the MLB API
+        started_by_day = {}
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+        active_pitcher_slot_set = frozenset(active_pitcher_slots)
+        empty = {}
+        for roster_date, roster_data in rosters.items():
+            started_players = {}
+            for team in roster_data:
+                team_id = team['id']
+                entries = team['roster']['entries']
+                started = []
+                append_started = started.append
+                all_players = []
+                for entry in entries:
+                    lineup_slot_id = entry['lineupSlotId']
+                    player = entry.get('playerPoolEntry', empty).get('player', empty)
+                    player_name = player.get('fullName')
+                    player_id = entry['playerId']
+                    if debug_enabled:
+                        slot_status = "Active" if lineup_slot_id in active_pitcher_slot_set else "Bench" if lineup_slot_id == 16 else "Other"
+                        logging.debug("Roster entry for team %s: player=%s, ID=%s, slot=%s, status=%s, eligible_slots=%s, defaultPositionId=%s", team_names[team_id], player_name, player_id, lineup_slot_id, slot_status, player.get('eligibleSlots', []), player.get('defaultPositionId', -1))
+                        all_players.append((player_name, player_id, lineup_slot_id, slot_status))
+                    if not player_name:
+                        logging.debug("Skipping entry with no player name for team %s, ID=%s, slot=%s", team_names[team_id], player_id, lineup_slot_id)
                         continue
+                    if is_hitting_cat:
+                        if lineup_slot_id <= 12:
+                            append_started((player_id, player_name, lineup_slot_id))
+                    elif is_pitching_cat:
+                        if lineup_slot_id in active_pitcher_slot_set:
+                            append_started((player_id, player_name, lineup_slot_id))
+                        else:
+                            logging.debug("Skipping %s (ID: %s) in slot %s as they are not in an active pitcher slot", player_name, player_id, lineup_slot_id)
+                            continue
+                    else:
+                        logging.debug("Invalid stat_category for player %s: %s", player_name, stat_category)
+                started_players[team_id] = started
+                if debug_enabled:
+                    logging.debug("Team %s roster on %s: %s", team_names[team_id], roster_date, all_players)
+                logging.debug("Team %s has %s started players", team_names[team_id], len(started))
+            started_by_day[roster_date] = started_players
+
+        # Resolve MLB IDs for every started player in one batch
+        group = 'hitting' if is_hitting_cat else 'pitching'
+        started_names = {player_id: player_name for started_players in started_by_day.values() for players in started_players.values() for player_id, player_name, _ in players}
+        mlb_id_cache = get_mlb_ids(started_names, group)
+
+        # Load every cached game log for the contest's players in a single query
+        player_ids = set(started_names)
+        pc_by_id = {}
+        if player_ids:
+            player_caches = PlayerCache.query.filter(PlayerCache.espn_id.in_(player_ids), PlayerCache.season == YEAR, PlayerCache.group == group).all()
+            pc_by_id = {player_cache.espn_id: player_cache for player_cache in player_caches}
+        logging.debug("Loaded %s cached game logs for %s started players", len(pc_by_id), len(player_ids))
+
+        # Load or fetch each started player's season game log once, up front, so the day loop only indexes into memory
+        game_log_cache = {}
+        pending_game_logs = {}
+        missing_logs = {}
+        for player_id, player_name in started_names.items():
+            mlb_id = mlb_id_cache.get(player_id)
+            if not mlb_id:
+                continue
+            player_cache = pc_by_id.get(player_id)
+            if player_cache and player_cache.game_log:
+                game_log_cache[player_id] = index_game_log(orjson.loads(player_cache.game_log))
+            else:
+                missing_logs[player_id] = (player_name, mlb_id)
+        logging.debug("Using %s cached game logs, fetching %s from the MLB API", len(game_log_cache), len(missing_logs))
+
+        # Fetch every missing game log concurrently; rows are stored once the contest is done
+        if missing_logs:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {executor.submit(fetch_game_log, mlb_id, group): player_id for player_id, (_, mlb_id) in missing_logs.items()}
+                for future in as_completed(futures):
+                    player_id = futures[future]
+                    player_name, mlb_id = missing_logs[player_id]
+                    try:
+                        game_log_data = future.result()
+                    except requests.RequestException as e:
+                        logging.debug("MLB API error for player %s (ID: %s): %s", player_name, player_id, e)
+                        continue
+                    try:
+                        game_log = game_log_data['stats'][0]['splits']
+                    except (KeyError, IndexError):
+                        logging.debug("No game log structure for player %s (ESPN ID: %s, MLB ID: %s)", player_name, player_id, mlb_id)
+                        continue
+                    game_log_cache[player_id] = index_game_log(game_log)
+                    pending_game_logs[player_id] = (player_name, mlb_id, game_log)
+
+        key_parsers = [(key, STAT_PARSERS.get(key, float)) for key in mlb_keys]
+        # Unparseable stat values are counted and reported once per contest rather than per row
+        invalid_stat_count = 0
+        invalid_stat_samples = []
+        for day_offset in range(len(no_data_days)):
+            chunk_date = start_date + timedelta(days=day_offset)
+            date_str = chunk_date.isoformat()
+            logging.debug("Processing scoring period %s for date %s", (chunk_date - season_start).days + 1, chunk_date)
+            processed_players = set()
+
+            roster_data = rosters.get(chunk_date, [])
+            if not roster_data:
+                if chunk_date not in all_star_break or not is_pitching_cat:
+                    no_data_days[day_offset] = 1
+                if is_july_ip_test:
+                    ip_per_day[date_str] = []
+                    logging.debug("No pitching stats for %s, added empty IP entry for King Hoser", date_str)
+                continue
+
+            started_players = started_by_day[chunk_date]
+            daily_stats_found = False
+
+            for team_id, players in started_players.items():
+                # Resolved once per team rather than on every player row
+                team_name = team_names[team_id]
+                team_i = team_index[team_id]
+                record_test = test_log is not None and team_name == test_team
+                for player_id, player_name, lineup_slot_id in players:
+                    mlb_id = mlb_id_cache.get(player_id)
+                    if not mlb_id:
+                        logging.warning("Skipped player %s (ESPN ID: %s) for team %s on %s due to no MLB ID", player_name, player_id, team_name, date_str)
+                        continue
+                    if mlb_id in processed_players:
+                        continue
+                    processed_players.add(mlb_id)
 
-                    started_players = {}
-                    daily_stats_found = False
-                    for team in roster_data:
-                        team_id = team['id']
-                        started = []
-                        all_players = []
-                        for entry in team['roster']['entries']:
-                            lineup_slot_id = entry['lineupSlotId']
-                            player = entry.get('playerPoolEntry', {}).get('player', {})
-                            player_name = player.get('fullName')
-                            player_id = entry['playerId']
-                            eligible_slots = player.get('eligibleSlots', [])
-                            default_position_id = player.get('defaultPositionId', -1)
-                            slot_status = "Active" if lineup_slot_id in active_pitcher_slots else "Bench" if lineup_slot_id == 16 else "Other"
-                            logging.debug(f"Roster entry for team {team_names[team_id]}: player={player_name}, ID={player_id}, slot={lineup_slot_id}, status={slot_status}, eligible_slots={eligible_slots}, defaultPositionId={default_position_id}")
-                            all_players.append((player_name, player_id, lineup_slot_id, slot_status))
-                            if not player_name:
-                                logging.debug(f"Skipping entry with no player name for team {team_names[team_id]}, ID={player_id}, slot={lineup_slot_id}")
-                                continue
-                            if stat_category in hitting_categories:
-                                if lineup_slot_id <= 12:
-                                    started.append((player_id, player_name, lineup_slot_id))
-                            elif stat_category in pitching_categories:
-                                if lineup_slot_id in active_pitcher_slots:
-                                    started.append((player_id, player_name, lineup_slot_id))
-                                else:
-                                    logging.debug(f"Skipping {player_name} (ID: {player_id}) in slot {lineup_slot_id} as they are not in an active pitcher slot")
-                                    continue
-                            else:
-                                logging.debug(f"Invalid stat_category for player {player_name}: {stat_category}")
-                        started_players[team_id] = started
-                        logging.debug(f"Team {team_names[team_id]} roster on {chunk_date}: {[(name, id, slot, status) for name, id, slot, status in all_players]}")
-                        logging.debug(f"Team {team_names[team_id]} has {len(started)} started players")
-
-                    group = 'hitting' if stat_category in hitting_categories else 'pitching'
-                    for team_id, players in started_players.items():
-                        for player_id, player_name, lineup_slot_id in players:
-                            if player_id not in mlb_id_cache:
-                                mlb_id = get_mlb_id(player_name, player_id)
-                                if mlb_id:
-                                    mlb_id_cache[player_id] = mlb_id
-                                else:
-                                    logging.warning(f"No MLB ID for player {player_name} (ESPN ID: {player_id})")
-                                    continue
-                            mlb_id = mlb_id_cache.get(player_id)
-                            if not mlb_id:
-                                logging.warning(f"Skipped player {player_name} (ESPN ID: {player_id}) for team {team_names[team_id]} on {date_str} due to no MLB ID")
-                                continue
-                            if mlb_id in processed_players:
+                    game_log_by_date = game_log_cache.get(player_id)
+                    if game_log_by_date is None:
+                        continue
+                    daily_stats_list = game_log_by_date.get(date_str, ())
+                    if len(daily_stats_list) > 1:
+                        logging.warning("Multiple game entries found for player %s (MLB ID: %s) on %s: %s games", player_name, mlb_id, date_str, len(daily_stats_list))
+                        logging.debug("Doubleheader detected for player %s on %s", player_name, date_str)
+                    if not daily_stats_list:
+                        logging.debug("No stats for player %s on %s", player_name, date_str)
+                        continue
+                    daily_stats_found = True
+
+                    aggregated_stats = {}
+                    for stat_dict in daily_stats_list:
+                        for key, parser in key_parsers:
+                            if key not in stat_dict:
                                 continue
-                            processed_players.add(mlb_id)
-
-                            cache_key = f"game_log_{player_id}_{YEAR}_{group}"
-                            player_cache = PlayerCache.query.filter_by(espn_id=player_id, season=YEAR, group=group).first()
-                            if player_cache and player_cache.game_log:
-                                game_log = json.loads(player_cache.game_log)
-                                logging.debug(f"Database cache hit for game log: {cache_key}")
-                            else:
-                                game_log_url = f"{MLB_BASE_URL}/people/{mlb_id}/stats?stats=gameLog&season={YEAR}&group={group}"
-                                try:
-                                    game_log_response = requests.get(game_log_url, timeout=5)
-                                    game_log_response.raise_for_status()
-                                except requests.RequestException as e:
-                                    logging.debug(f"MLB API error for player {player_name} (ID: {player_id}): {str(e)}")
-                                    continue
-                                game_log_data = game_log_response.json()
-                                try:
-                                    game_log = game_log_data['stats'][0]['splits']
-                                    game_log_cache[cache_key] = game_log
-                                    max_attempts_cache = max_attempts
-                                    attempts_cache = 0
-                                    while attempts_cache < max_attempts_cache:
-                                        try:
-                                            if player_cache:
-                                                player_cache.game_log = json.dumps(game_log)
-                                                player_cache.last_updated = datetime.now(timezone.utc)
-                                            else:
-                                                player_cache = PlayerCache(
-                                                    espn_id=player_id,
-                                                    player_name=player_name,
-                                                    mlb_id=mlb_id,
-                                                    season=YEAR,
-                                                    group=group,
-                                                    game_log=json.dumps(game_log)
-                                                )
-                                                db.session.add(player_cache)
-                                            db.session.commit()
-                                            logging.debug(f"Stored game log for player {player_name} (cache key: {cache_key})")
-                                            break
-                                        except OperationalError as e:
-                                            attempts_cache += 1
-                                            logging.error(f"Database error storing game log for {player_name}, attempt {attempts_cache}: {str(e)}")
-                                            db.session.rollback()
-                                            if attempts_cache < max_attempts_cache:
-                                                sleep(2)
-                                    if attempts_cache >= max_attempts_cache:
-                                        logging.debug(f"Failed to store game log for {player_name} after {max_attempts_cache} attempts")
-                                except (KeyError, IndexError) as e:
-                                    logging.debug(f"No game log structure for player {player_name} (ESPN ID: {player_id}, MLB ID: {mlb_id})")
-                                    continue
-                            game_log = game_log_cache.get(cache_key, game_log)
-                            daily_stats_list = [s['stat'] for s in game_log if s.get('date') == date_str]
-                            if len(daily_stats_list) > 1:
-                                logging.warning(f"Multiple game entries found for player {player_name} (MLB ID: {mlb_id}) on {date_str}: {len(daily_stats_list)} games")
-                                logging.debug(f"Doubleheader detected for player {player_name} on {date_str}")
-                            if not daily_stats_list:
-                                logging.debug(f"No stats for player {player_name} on {date_str}")
+                            value = stat_dict[key]
+                            # The API sends most counts as plain numbers; only strings need parsing
+                            if parser is float and type(value) in (int, float):
+                                aggregated_stats[key] = aggregated_stats.get(key, 0.0) + value
                                 continue
-                            daily_stats_found = True
-
-                            aggregated_stats = {}
-                            for stat_dict in daily_stats_list:
-                                for key, value in stat_dict.items():
-                                    if key == 'inningsPitched':
-                                        ip_value = parse_ip(value)
-                                        aggregated_stats[key] = aggregated_stats.get(key, 0.0) + ip_value
-                                        logging.debug(f"Parsed IP for {player_name} on {date_str}: raw={value}, parsed={ip_value}")
-                                    else:
-                                        try:
-                                            aggregated_stats[key] = aggregated_stats.get(key, 0.0) + float(value)
-                                        except (ValueError, TypeError):
-                                            if key == 'homeRuns' and isinstance(value, str) and 'HR' in value:
-                                                hr_count = 1 if 'HR' in value else 0
-                                                aggregated_stats[key] = aggregated_stats.get(key, 0.0) + hr_count
-                                                logging.debug(f"Parsed HR from string '{value}' for {player_name} on {date_str}: {hr_count}")
-                                            elif key == 'rbi' and isinstance(value, str) and 'RBI' in value:
-                                                rbi_count = 1 if 'RBI' in value else 0
-                                                aggregated_stats[key] = aggregated_stats.get(key, 0.0) + rbi_count
-                                                logging.debug(f"Parsed RBI from string '{value}' for {player_name} on {date_str}: {rbi_count}")
-                                            else:
-                                                logging.warning(f"Invalid stat value for {key}='{value}' for player {player_name} on {date_str}, skipping")
-                                                aggregated_stats[key] = aggregated_stats.get(key, 0.0)
-
-                            logging.debug(f"Aggregated daily stats for player ID {player_id} (MLB ID: {mlb_id}) on {date_str}: {aggregated_stats}")
-                            if stat_category == 'OBP':
-                                h = aggregated_stats.get('hits', 0)
-                                bb = aggregated_stats.get('baseOnBalls', 0)
-                                hbp = aggregated_stats.get('hitByPitch', 0)
-                                ab = aggregated_stats.get('atBats', 0)
-                                sf = aggregated_stats.get('sacFlies', 0)
-                                pa = ab + bb + hbp + sf
-                                if pa > 0:
-                                    if h > ab:
-                                        logging.warning(f"Invalid stats for player ID {player_id}: Hits ({h}) > At Bats ({ab})")
-                                        continue
-                                    team_stats[team_names[team_id]]['num'] += h + bb + hbp
-                                    team_stats[team_names[team_id]]['den'] += pa
-                            elif stat_category == 'AVG':
-                                h = aggregated_stats.get('hits', 0)
-                                bb = aggregated_stats.get('baseOnBalls', 0)
-                                hbp = aggregated_stats.get('hitByPitch', 0)
-                                ab = aggregated_stats.get('atBats', 0)
-                                sf = aggregated_stats.get('sacFlies', 0)
-                                pa = ab + bb + hbp + sf
-                                if pa > 0:
-                                    if h > ab:
-                                        logging.warning(f"Invalid stats for player ID {player_id}: Hits ({h}) > At Bats ({ab})")
-                                        continue
-                                    team_stats[team_names[team_id]]['num'] += h
-                                    team_stats[team_names[team_id]]['den'] += ab
-                            elif stat_category == 'HR':
-                                hr = aggregated_stats.get('homeRuns', 0)
-                                team_stats[team_names[team_id]]['total'] += hr
-                                if is_june_hr_test and team_names[team_id] == "B. Hackenburg" and hr > 0:
-                                    hr_per_day[date_str].append((player_name, hr))
-                                    logging.debug(f"Adding {hr} HR for player {player_name} (ESPN ID: {player_id}, MLB ID: {mlb_id}) on {date_str} to team B. Hackenburg")
-                            elif stat_category == 'RBI':
-                                rbi = aggregated_stats.get('rbi', 0)
-                                team_stats[team_names[team_id]]['total'] += rbi
-                                if (is_march_rbi_test or is_april_rbi_test or is_may_rbi_test or is_june_rbi_test or is_july_rbi_test) and team_names[team_id] == "B. Hackenburg" and rbi > 0:
-                                    rbi_per_day[date_str].append((player_name, rbi))
-                                    logging.debug(f"Adding {rbi} RBI for player {player_name} (ESPN ID: {player_id}, MLB ID: {mlb_id}) on {date_str} to team B. Hackenburg")
-                            elif stat_category == 'HITS':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('hits', 0)
-                            elif stat_category == 'RUNS SCORED':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('runs', 0)
-                            elif stat_category == 'WALKS':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('baseOnBalls', 0)
-                            elif stat_category == 'STOLEN BASES':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('stolenBases', 0)
-                            elif stat_category == 'SLUGGING PERCENTAGE':
-                                total_bases = aggregated_stats.get('totalBases', 0)
-                                bb = aggregated_stats.get('baseOnBalls', 0)
-                                hbp = aggregated_stats.get('hitByPitch', 0)
-                                ab = aggregated_stats.get('atBats', 0)
-                                sf = aggregated_stats.get('sacFlies', 0)
-                                pa = ab + bb + hbp + sf
-                                if pa > 0:
-                                    if total_bases > 4 * ab:
-                                        logging.warning(f"Invalid stats for player ID {player_id}: Total Bases ({total_bases}) > 4 * At Bats ({ab})")
-                                        continue
-                                    team_stats[team_names[team_id]]['num'] += total_bases
-                                    team_stats[team_names[team_id]]['den'] += ab
-                            elif stat_category == 'INNINGS PITCHED':
-                                ip = aggregated_stats.get('inningsPitched', 0)
-                                if lineup_slot_id not in active_pitcher_slots:
-                                    logging.warning(f"Player {player_name} (ID: {player_id}) in slot {lineup_slot_id} is not active but has {ip} IP on {date_str}, skipping")
-                                    continue
-                                team_stats[team_names[team_id]]['total'] += ip
-                                if is_july_ip_test and team_names[team_id] == "King Hoser" and ip > 0:
-                                    ip_per_day[date_str].append((player_name, ip, lineup_slot_id))
-                                    logging.debug(f"Adding {ip} IP for player {player_name} (ESPN ID: {player_id}, MLB ID: {mlb_id}) on {date_str} to team King Hoser in slot {lineup_slot_id}")
-                            elif stat_category == 'HITS ALLOWED':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('hits', 0)
-                            elif stat_category == 'ERA':
-                                er = aggregated_stats.get('earnedRuns', 0)
-                                ip = aggregated_stats.get('inningsPitched', 0)
-                                if ip > 0:
-                                    if er < 0:
-                                        logging.warning(f"Invalid stats for player ID {player_id}: Earned Runs ({er}) < 0")
-                                        continue
-                                    team_stats[team_names[team_id]]['num'] += er * 9
-                                    team_stats[team_names[team_id]]['den'] += ip
-                            elif stat_category == 'WALKS ALLOWED':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('baseOnBalls', 0)
-                            elif stat_category == 'STRIKEOUTS':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('strikeOuts', 0)
-                            elif stat_category == 'QUALITY STARTS':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('qualityStarts', 0)
-                            elif stat_category == 'WINS':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('wins', 0)
-                            elif stat_category == 'SAVES':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('saves', 0)
-                            elif stat_category == 'SAVES + HOLDS':
-                                team_stats[team_names[team_id]]['total'] += aggregated_stats.get('saves', 0) + aggregated_stats.get('holds', 0)
-                            elif stat_category == 'WHIP':
-                                hits = aggregated_stats.get('hits', 0)
-                                bb = aggregated_stats.get('baseOnBalls', 0)
-                                ip = aggregated_stats.get('inningsPitched', 0)
-                                if ip > 0:
-                                    if hits < 0 or bb < 0:
-                                        logging.warning(f"Invalid stats for player ID {player_id}: Hits ({hits}) or Walks ({bb}) < 0")
-                                        continue
-                                    team_stats[team_names[team_id]]['num'] += hits + bb
-                                    team_stats[team_names[team_id]]['den'] += ip
-                            elif stat_category == 'K/BB':
-                                k = aggregated_stats.get('strikeOuts', 0)
-                                bb = aggregated_stats.get('baseOnBalls', 0)
-                                team_stats[team_names[team_id]]['num'] += k
-                                team_stats[team_names[team_id]]['den'] += bb
-                    if not daily_stats_found and stat_category in pitching_categories and chunk_date not in all_star_break:
-                        no_data_days.append(chunk_date)
-                        if is_july_ip_test:
-                            ip_per_day[date_str] = []
-                            logging.debug(f"No pitching stats for {date_str}, added empty IP entry for King Hoser")
-                    chunk_date += timedelta(days=1)
-                current = chunk_end + timedelta(days=1)
-
-            # Test additions logging
-            if is_june_hr_test:
-                logging.info("June HR Test Results for Team B. Hackenburg (Daily Breakdown):")
-                total_hr = 0
-                for day in sorted(hr_per_day.keys()):
-                    daily_hr = hr_per_day[day]
-                    if daily_hr:
-                        daily_total = sum(hr for _, hr in daily_hr)
-                        total_hr += daily_total
-                        player_str = ", ".join(f"{player}: {int(hr)}" for player, hr in sorted(daily_hr))
-                        logging.info(f"Date {day}: Total HR {int(daily_total)}, Players: {player_str}")
-                    else:
-                        logging.info(f"Date {day}: Total HR 0, No HRs hit")
-                logging.info(f"Overall Total HR for B. Hackenburg in June: {int(total_hr)}")
-
-            if is_march_rbi_test or is_april_rbi_test or is_may_rbi_test or is_june_rbi_test or is_july_rbi_test:
-                month = "March" if is_march_rbi_test else "April" if is_april_rbi_test else "May" if is_may_rbi_test else "June" if is_june_rbi_test else "July"
-                logging.info(f"{month} RBI Test Results for Team B. Hackenburg (Daily Breakdown):")
-                total_rbi = 0
-                for day in sorted(rbi_per_day.keys()):
-                    daily_rbi = rbi_per_day[day]
-                    if daily_rbi:
-                        daily_total = sum(rbi for _, rbi in daily_rbi)
-                        total_rbi += daily_total
-                        player_str = ", ".join(f"{player}: {int(rbi)}" for player, rbi in sorted(daily_rbi))
-                        logging.info(f"Date {day}: Total RBI {int(daily_total)}, Players: {player_str}")
-                    else:
-                        logging.info(f"Date {day}: Total RBI 0, No RBIs")
-                logging.info(f"Overall Total RBI for B. Hackenburg in {month}: {int(total_rbi)}")
-
-            if is_july_ip_test:
-                logging.info("July IP Test Results for King Hoser (Daily Breakdown):")
-                total_ip = 0.0
-                current = start_date
-                while current <= end_date:
-                    day_str = current.strftime('%Y-%m-%d')
-                    daily_ip = ip_per_day.get(day_str, [])
-                    if daily_ip:
-                        daily_total = sum(ip for _, ip, _ in daily_ip)
-                        total_ip += daily_total
-                        player_str = ", ".join(f"{player}: {format_stat(ip, 'INNINGS PITCHED')} (slot {slot})" for player, ip, slot in sorted(daily_ip))
-                        logging.info(f"Date {day_str}: Total IP {format_stat(daily_total, 'INNINGS PITCHED')}, Players: {player_str}")
-                    else:
-                        logging.info(f"Date {day_str}: Total IP 0.0, No IP")
-                    current += timedelta(days=1)
-                logging.info(f"Overall Total IP for King Hoser in July: {format_stat(total_ip, 'INNINGS PITCHED')}")
-
-            logging.debug(f"Team {stat_category} components:")
-            for team_name, data in team_stats.items():
-                if 'num' in data and 'den' in data:
-                    value = data['num'] / data['den'] if data['den'] > 0 else 999.0 if data['num'] > 0 else 0.0
-                    logging.debug(f"Team {team_name}: num={data['num']}, den={data['den']}, {stat_category}={value:.4f}")
+                            try:
+                                parsed = parser(value)
+                            except (ValueError, TypeError):
+                                if key == 'homeRuns' and isinstance(value, str) and 'HR' in value:
+                                    parsed = 1
+                                    logging.debug("Parsed HR from string '%s' for %s on %s: %s", value, player_name, date_str, parsed)
+                                elif key == 'rbi' and isinstance(value, str) and 'RBI' in value:
+                                    parsed = 1
+                                    logging.debug("Parsed RBI from string '%s' for %s on %s: %s", value, player_name, date_str, parsed)
+                                else:
+                                    logging.debug("Invalid stat value for %s='%s' for player %s on %s, skipping", key, value, player_name, date_str)
+                                    invalid_stat_count += 1
+                                    if len(invalid_stat_samples) < 5:
+                                        invalid_stat_samples.append((player_name, date_str, key, value))
+                                    parsed = 0.0
+                            aggregated_stats[key] = aggregated_stats.get(key, 0.0) + parsed
+
+                    logging.debug("Aggregated daily stats for player ID %s (MLB ID: %s) on %s: %s", player_id, mlb_id, date_str, aggregated_stats)
+                    if row_check and not row_check(aggregated_stats, player_id):
+                        continue
+                    if record_test:
+                        test_value = aggregated_stats.get(test_key, 0)
+                        if test_value > 0:
+                            test_log[date_str].append((player_name, test_value, lineup_slot_id))
+                            logging.debug("Adding %s %s for player %s (ESPN ID: %s, MLB ID: %s) on %s to team %s in slot %s", test_value, test_key, player_name, player_id, mlb_id, date_str, test_team, lineup_slot_id)
+
+                    row_teams.append(team_i)
+                    for append_value, key in column_appends:
+                        append_value(aggregated_stats.get(key, 0.0))
+            if not daily_stats_found and is_pitching_cat and chunk_date not in all_star_break:
+                no_data_days[day_offset] = 1
+                if is_july_ip_test:
+                    ip_per_day[date_str] = []
+                    logging.debug("No pitching stats for %s, added empty IP entry for King Hoser", date_str)
+
+        if invalid_stat_count:
+            logging.warning("Skipped %s invalid stat values for contest %s, e.g. %s", invalid_stat_count, contest_id, invalid_stat_samples)
+
+        # Store every newly fetched game log in a single commit; IntegrityError means a contest computed in parallel
+        # inserted one of these players first, and the next attempt's lookup finds and updates that row
+        if pending_game_logs:
+            try:
+                commit_with_retry(lambda: stage_player_caches(pending_game_logs, group), "game log storage", retry_on=(OperationalError, IntegrityError))
+                logging.debug("Stored %s game logs for contest %s", len(pending_game_logs), contest_id)
+            except (OperationalError, IntegrityError) as e:
+                logging.error("Failed to store game logs for contest %s: %s", contest_id, e)
+
+        # Test additions logging
+        if is_june_hr_test:
+            logging.info("June HR Test Results for Team B. Hackenburg (Daily Breakdown):")
+            total_hr = 0
+            for day in sorted(hr_per_day.keys()):
+                daily_hr = hr_per_day[day]
+                if daily_hr:
+                    daily_total = sum(hr for _, hr, _ in daily_hr)
+                    total_hr += daily_total
+                    player_str = ", ".join(f"{player}: {int(hr)}" for player, hr, _ in sorted(daily_hr))
+                    logging.info("Date %s: Total HR %s, Players: %s", day, int(daily_total), player_str)
                 else:
-                    logging.debug(f"Team {team_name}: {stat_category}={data['total']}")
-
-            rankings = []
-            for team_name, data in team_stats.items():
-                if 'num' in data and 'den' in data:
-                    value = data['num'] / data['den'] if data['den'] > 0 else 999.0 if data['num'] > 0 else 0.0
+                    logging.info("Date %s: Total HR 0, No HRs hit", day)
+            logging.info("Overall Total HR for B. Hackenburg in June: %s", int(total_hr))
+
+        if is_rbi_test:
+            month = "March" if is_march_rbi_test else "April" if is_april_rbi_test else "May" if is_may_rbi_test else "June" if is_june_rbi_test else "July"
+            logging.info("%s RBI Test Results for Team B. Hackenburg (Daily Breakdown):", month)
+            total_rbi = 0
+            for day in sorted(rbi_per_day.keys()):
+                daily_rbi = rbi_per_day[day]
+                if daily_rbi:
+                    daily_total = sum(rbi for _, rbi, _ in daily_rbi)
+                    total_rbi += daily_total
+                    player_str = ", ".join(f"{player}: {int(rbi)}" for player, rbi, _ in sorted(daily_rbi))
+                    logging.info("Date %s: Total RBI %s, Players: %s", day, int(daily_total), player_str)
                 else:
-                    value = data['total']
-                rankings.append((team_name, value))
-
-            lower_is_better = ['HITS ALLOWED', 'ERA', 'WALKS ALLOWED', 'WHIP']
-            rankings.sort(key=lambda x: x[1], reverse=(stat_category not in lower_is_better))
-
-            warning_message = ""
-            if no_data_days:
-                warning_message = f"Warning: No pitching stats found for {len(no_data_days)} day(s): {', '.join(str(d) for d in no_data_days)}. Try a different date range."
-
-            chart_data = {
-                "labels": [team for team, _ in rankings],
-                "datasets": [{
-                    "label": stat_category,
-                    "data": [value for _, value in rankings],
-                    "backgroundColor": ["#4CAF50", "#2196F3", "#FF9800", "#F44336", "#9C27B0", "#3F51B5", "#FFEB3B", "#009688", "#E91E63", "#607D8B", "#FFC107", "#795548"],
-                    "borderColor": ["#388E3C", "#1976D2", "#F57C00", "#D32F2F", "#7B1FA2", "#303F9F", "#FBC02D", "#00796B", "#C2185B", "#455A64", "#FFB300", "#5D4037"],
-                    "borderWidth": 1
-                }]
-            }
+                    logging.info("Date %s: Total RBI 0, No RBIs", day)
+            logging.info("Overall Total RBI for B. Hackenburg in %s: %s", month, int(total_rbi))
 
-            status['is_started'] = True
-            if end_date > today:
-                status['is_complete'] = False
-                status['days_remaining'] = (end_date - today).days
-                status['winner'] = None
-            else:
-                status['is_complete'] = True
-                status['days_remaining'] = None
-                if rankings:
-                    top_score = rankings[0][1]
-                    winners = [team for team, value in rankings if value == top_score]
-                    status['winner'] = winners
-                    logging.debug(f"Contest {contest_id} winners: {winners}")
+        if is_july_ip_test:
+            logging.info("July IP Test Results for King Hoser (Daily Breakdown):")
+            total_ip = 0.0
+            current = start_date
+            while current <= end_date:
+                day_str = current.strftime('%Y-%m-%d')
+                daily_ip = ip_per_day.get(day_str, [])
+                if daily_ip:
+                    daily_total = sum(ip for _, ip, _ in daily_ip)
+                    total_ip += daily_total
+                    player_str = ", ".join(f"{player}: {format_stat(ip, 'INNINGS PITCHED')} (slot {slot})" for player, ip, slot in sorted(daily_ip))
+                    logging.info("Date %s: Total IP %s, Players: %s", day_str, format_stat(daily_total, 'INNINGS PITCHED'), player_str)
+                else:
+                    logging.info("Date %s: Total IP 0.0, No IP", day_str)
+                current += timedelta(days=1)
+            logging.info("Overall Total IP for King Hoser in July: %s", format_stat(total_ip, 'INNINGS PITCHED'))
+
+        key_totals = reduce_team_totals(row_teams, row_columns, len(team_ids))
+        nums, dens, values = team_values(stat_category, mlb_keys, key_totals)
+        if debug_enabled:
+            logging.debug("Team %s components:", stat_category)
+            for i, team_id in enumerate(team_ids):
+                if nums is not None:
+                    logging.debug("Team %s: num=%s, den=%s, %s=%.4f", team_names[team_id], nums[i], dens[i], stat_category, values[i])
                 else:
-                    status['winner'] = []
-                    logging.debug(f"Contest {contest_id} has no rankings data")
+                    logging.debug("Team %s: %s=%s", team_names[team_id], stat_category, values[i])
+
+        # Rank team positions by value; values.__getitem__ keeps the sort key in C
+        lower_is_better = ['HITS ALLOWED', 'ERA', 'WALKS ALLOWED', 'WHIP']
+        order = sorted(range(len(values)), key=values.__getitem__, reverse=(stat_category not in lower_is_better))
+        rankings = [(team_names[team_ids[i]], values[i]) for i in order]
+
+        warning_message = ""
+        if any(no_data_days):
+            missing_days = [start_date + timedelta(days=offset) for offset, flagged in enumerate(no_data_days) if flagged]
+            warning_message = f"Warning: No pitching stats found for {len(missing_days)} day(s): {', '.join(str(d) for d in missing_days)}. Try a different date range."
+
+        chart_data = {
+            "labels": [team for team, _ in rankings],
+            "datasets": [{
+                "label": stat_category,
+                "data": [value for _, value in rankings],
+                "backgroundColor": ["#4CAF50", "#2196F3", "#FF9800", "#F44336", "#9C27B0", "#3F51B5", "#FFEB3B", "#009688", "#E91E63", "#607D8B", "#FFC107", "#795548"],
+                "borderColor": ["#388E3C", "#1976D2", "#F57C00", "#D32F2F", "#7B1FA2", "#303F9F", "#FBC02D", "#00796B", "#C2185B", "#455A64", "#FFB300", "#5D4037"],
+                "borderWidth": 1
+            }]
+        }
+
+        status['is_started'] = True
+        if end_date > today:
+            status['is_complete'] = False
+            status['days_remaining'] = (end_date - today).days
+            status['winner'] = None
+        else:
+            status['is_complete'] = True
+            status['days_remaining'] = None
+            if rankings:
+                top_score = rankings[0][1]
+                winners = [team for team, value in rankings if value == top_score]
+                status['winner'] = winners
+                logging.debug("Contest %s winners: %s", contest_id, winners)
+            else:
+                status['winner'] = []
+                logging.debug("Contest %s has no rankings data", contest_id)
 
-            logging.debug(f"Computed stats for contest {contest_id}: {len(rankings)} teams, status={status}")
-            return rankings, chart_data, warning_message, status
+        logging.debug("Computed stats for contest %s: %s teams, status=%s", contest_id, len(rankings), status)
+        return rankings, chart_data, warning_message, status
 
-        except OperationalError as e:
-            attempts += 1
-            logging.error(f"Database error in compute_contest_stats attempt {attempts}: {str(e)}")
-            db.session.rollback()
-            if attempts < max_attempts:
-                sleep(2)
-            else:
-                raise ValueError(f"Database error after {max_attempts} attempts: {str(e)}")
+    except OperationalError as e:
+        logging.error("Database error in compute_contest_stats: %s", e)
+        db.session.rollback()
+        raise ValueError(f"Database error computing contest stats: {str(e)}")
+    except Exception as e:
+        logging.error("Error computing stats for contest %s: %s", contest_id, e)
+        raise ValueError(f"Error computing contest stats: {str(e)}")
+
+# Cache purges run here so a refresh never blocks the request thread
+cache_purge_executor = ThreadPoolExecutor(max_workers=2)
+
+def memoize_key(f, *args):
+    return f.make_cache_key(f.uncached, *args)
+
+def purge_cache_keys(keys):
+    with app.app_context():
+        try:
+            cache.delete_many(*keys)
+            logging.debug("Purged %s cache keys", len(keys))
         except Exception as e:
-            logging.error(f"Error computing stats for contest {contest_id}: {str(e)}")
-            raise ValueError(f"Error computing contest stats: {str(e)}")
+            logging.error("Error purging cache keys: %s", e)
 
-def get_contest_data(contest_id):
-    logging.debug(f"Getting contest data for contest {contest_id}")
-    max_attempts = 3
-    attempts = 0
-    while attempts < max_attempts:
+def invalidate_contest(contest_id):
+    # Collect every memoized entry the contest's stats were built from and purge them as one batch
+    keys = [memoize_key(compute_contest_stats, contest_id)]
+    contest = db.session.get(Contest, contest_id)
+    league = contest.league if contest else None
+    if league:
         try:
-            contest = db.session.get(Contest, contest_id)
-            if not contest:
-                logging.error(f"Contest {contest_id} not found in database")
-                raise ValueError("Contest not found.")
-
-            result = ContestResult.query.filter_by(contest_id=contest_id).order_by(ContestResult.last_updated.desc()).first()
-            today = date.today()
-            end_date = date.fromisoformat(contest.end_date)
-            needs_update = not result or (result.last_updated.date() < today and end_date >= today)
-
-            if not needs_update:
-                logging.debug(f"Using stored ContestResult for contest {contest_id}, last updated {result.last_updated}")
-                try:
-                    return json.loads(result.rankings), json.loads(result.chart_data), result.warning_message, json.loads(result.status)
-                except json.JSONDecodeError as e:
-                    logging.error(f"Error decoding JSON for contest {contest_id}: {str(e)}")
-                    needs_update = True
-
-            logging.debug(f"Computing new stats for contest {contest_id}, needs_update={needs_update}")
-            rankings, chart_data, warning_message, status = compute_contest_stats(contest_id)
-
-            new_result = ContestResult(
-                contest_id=contest_id,
-                rankings=json.dumps(rankings),
-                chart_data=json.dumps(chart_data),
-                warning_message=warning_message,
-                status=json.dumps(status),
-                last_updated=datetime.now(timezone.utc)
-            )
-            db.session.add(new_result)
-            db.session.commit()
-            logging.debug(f"Saved new ContestResult for contest {contest_id}")
+            cookies = {'espn_s2': league.espn_s2_decrypted, 'swid': league.swid_decrypted}
+        except InvalidToken:
+            logging.warning("Could not decrypt cookies for league %s, purging contest stats only", league.espn_league_id)
+        else:
+            keys.append(memoize_key(get_team_names, league.espn_league_id, cookies))
+            start_date = date.fromisoformat(contest.start_date)
+            effective_end = min(date.fromisoformat(contest.end_date), date.today())
+            keys.append(memoize_key(get_team_rosters, league.espn_league_id, cookies, start_date, effective_end, SEASON_START))
+    logging.debug("Queueing %s cache keys for purge for contest %s", len(keys), contest_id)
+    return cache_purge_executor.submit(purge_cache_keys, keys)
+
+@lru_cache(maxsize=512)
+def load_contest_result(result_id, last_updated):
+    # Stored results are never edited in place, so a given row decodes to the same payload every time; callers must not mutate it
+    rankings, chart_data, warning_message, status = db.session.query(ContestResult.rankings, ContestResult.chart_data, ContestResult.warning_message, ContestResult.status).filter(ContestResult.id == result_id).one()
+    return orjson.loads(rankings), orjson.loads(chart_data), warning_message, orjson.loads(status)
+
+def contest_result_row(contest_id, rankings, chart_data, warning_message, status):
+    # Column values for a ContestResult insert, encoded once
+    return {
+        'contest_id': contest_id,
+        'rankings': orjson.dumps(rankings).decode(),
+        'chart_data': orjson.dumps(chart_data).decode(),
+        'warning_message': warning_message,
+        'status': orjson.dumps(status).decode(),
+        'last_updated': datetime.now(timezone.utc)
+    }
+
+def store_contest_results(rows):
+    # One Core INSERT for every row, skipping ORM object construction and per-row flushes; raises OperationalError once retries run out
+    commit_with_retry(lambda: db.session.execute(insert(ContestResult), rows), "contest results storage")
+    logging.debug("Stored %s ContestResult rows", len(rows))
+
+def get_contest_data(contest_id, pending_results=None):
+    # With pending_results, a freshly computed row is appended there for the caller to store in bulk instead of committed here
+    logging.debug("Getting contest data for contest %s", contest_id)
+
+    def load():
+        # Returns the contest data and the newly computed row, or None when the stored result was reused
+        contest = db.session.get(Contest, contest_id)
+        if not contest:
+            logging.error("Contest %s not found in database", contest_id)
+            raise ValueError("Contest not found.")
+
+        # Only the id and timestamp are needed to decide; the JSON payload is loaded when it is actually reused
+        result = db.session.query(ContestResult.id, ContestResult.last_updated).filter_by(contest_id=contest_id).order_by(ContestResult.last_updated.desc()).first()
+        today = date.today()
+        end_date = date.fromisoformat(contest.end_date)
+        needs_update = not result or (result.last_updated.date() < today and end_date >= today)
+
+        if not needs_update:
+            logging.debug("Using stored ContestResult for contest %s, last updated %s", contest_id, result.last_updated)
+            try:
+                return load_contest_result(result.id, result.last_updated), None
+            except orjson.JSONDecodeError as e:
+                logging.error("Error decoding JSON for contest %s: %s", contest_id, e)
+                needs_update = True
 
-            return rankings, chart_data, warning_message, status
+        logging.debug("Computing new stats for contest %s, needs_update=%s", contest_id, needs_update)
+        rankings, chart_data, warning_message, status = compute_contest_stats(contest_id)
 
-        except OperationalError as e:
-            attempts += 1
-            logging.error(f"Database error in get_contest_data attempt {attempts}: {str(e)}")
-            db.session.rollback()
-            if attempts < max_attempts:
-                sleep(2)
-        except Exception as e:
-            logging.error(f"Error computing stats for contest {contest_id}: {str(e)}")
-            raise ValueError(f"Error computing contest stats: {str(e)}")
-    raise ValueError(f"Database error after {max_attempts} attempts")
+        row = contest_result_row(contest_id, rankings, chart_data, warning_message, status)
+        if pending_results is None:
+            db.session.execute(insert(ContestResult).values(**row))
+        return (rankings, chart_data, warning_message, status), row
+
+    try:
+        data, row = commit_with_retry(load, "contest data load")
+    except OperationalError:
+        raise ValueError("Database error loading contest data. Please try again later.")
+    except Exception as e:
+        logging.error("Error computing stats for contest %s: %s", contest_id, e)
+        raise ValueError(f"Error computing contest stats: {str(e)}")
+    if row is not None:
+        if pending_results is not None:
+            pending_results.append(row)
+        else:
+            logging.debug("Saved new ContestResult for contest %s", contest_id)
+    return data
+
+def load_contest_data(contest_id):
+    # Worker-thread wrapper: its own app context (and so its own db session), errors and new result rows handed back to the caller
+    pending_results = []
+    with app.app_context():
+        try:
+            return get_contest_data(contest_id, pending_results), None, pending_results
+        except (InvalidToken, ValueError) as e:
+            return None, e, pending_results
 
 @app.route('/')
 def home():
@@ -853,53 +882,45 @@ def home():
 def register():
     form = RegistrationForm()
     if form.validate_on_submit():
-        max_attempts = 3
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                existing_user = User.query.filter_by(username=form.username.data).first()
-                if existing_user:
-                    flash("Username already exists. Please choose another.")
-                    return render_template('register.html', form=form)
-                hashed_password = generate_password_hash(form.password.data, method='scrypt')
-                new_user = User(username=form.username.data, email=form.email.data, password_hash=hashed_password)
-                db.session.add(new_user)
-                db.session.commit()
-                login_user(new_user)
-                return redirect(url_for('link_league'))
-            except OperationalError as e:
-                attempts += 1
-                logging.error(f"Database error during registration attempt {attempts}: {str(e)}")
-                db.session.rollback()
-                if attempts < max_attempts:
-                    sleep(2)
-        flash("Error creating user due to database issues. Please try again later.", "error")
-        return render_template('register.html', form=form)
+        hashed_password = generate_password_hash(form.password.data, method='scrypt')
+        def add_user():
+            # None when the username is taken
+            if User.query.filter_by(username=form.username.data).first():
+                return None
+            new_user = User(username=form.username.data, email=form.email.data, password_hash=hashed_password)
+            db.session.add(new_user)
+            return new_user
+        try:
+            new_user = commit_with_retry(add_user, "registration")
+        except OperationalError:
+            flash("Error creating user due to database issues. Please try again later.", "error")
+            return render_template('register.html', form=form)
+        if new_user is None:
+            flash("Username already exists. Please choose another.")
+            return render_template('register.html', form=form)
+        login_user(new_user)
+        return redirect(url_for('link_league'))
     return render_template('register.html', form=form)
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     form = LoginForm()
     if form.validate_on_submit():
-        max_attempts = 3
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                user = User.query.filter_by(username=form.username.data).first()
-                if user and check_password_hash(user.password_hash, form.password.data):
-                    login_user(user)
-                    if not user.leagues:
-                        return redirect(url_for('link_league'))
-                    return redirect(url_for('dashboard'))
-                flash("Invalid credentials. Try again.")
-                return render_template('login.html', form=form)
-            except OperationalError as e:
-                attempts += 1
-                logging.error(f"Database error during login attempt {attempts}: {str(e)}")
-                db.session.rollback()
-                if attempts < max_attempts:
-                    sleep(2)
-        flash("Error logging in due to database issues. Please try again later.", "error")
+        def find_user():
+            # Everything the redirect needs, read together so a retry re-reads all of it
+            user = User.query.filter_by(username=form.username.data).first()
+            return user, bool(user and user.leagues)
+        try:
+            user, has_leagues = commit_with_retry(find_user, "login")
+        except OperationalError:
+            flash("Error logging in due to database issues. Please try again later.", "error")
+            return render_template('login.html', form=form)
+        if user and check_password_hash(user.password_hash, form.password.data):
+            login_user(user)
+            if not has_leagues:
+                return redirect(url_for('link_league'))
+            return redirect(url_for('dashboard'))
+        flash("Invalid credentials. Try again.")
         return render_template('login.html', form=form)
     return render_template('login.html', form=form)
 
@@ -920,7 +941,7 @@ def link_league():
         cookies = {'espn_s2': espn_s2, 'swid': swid}
         settings_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/flb/seasons/{YEAR}/segments/0/leagues/{espn_league_id}?view=mSettings"
         try:
-            response = requests.get(settings_url, headers=HEADERS, cookies=cookies, timeout=5)
+            response = http_session.get(settings_url, headers=HEADERS, cookies=cookies, timeout=5)
             response.raise_for_status()
         except requests.RequestException:
             flash("Invalid league details or credentials. Please check and try again.")
@@ -928,50 +949,44 @@ def link_league():
         data = response.json()
         league_name = data.get('settings', {}).get('name', f'League {espn_league_id}')
         lineupSlotCounts = data.get('settings', {}).get('rosterSettings', {}).get('lineupSlotCounts', {})
-        logging.debug(f"Raw lineupSlotCounts for league {espn_league_id}: {lineupSlotCounts}")
+        logging.debug("Raw lineupSlotCounts for league %s: %s", espn_league_id, lineupSlotCounts)
         active_pitcher_slots = [int(k) for k, v in lineupSlotCounts.items() if 13 <= int(k) <= 15 and v > 0]
         if not active_pitcher_slots:
-            logging.warning(f"No valid pitcher slots found in lineupSlotCounts for league {espn_league_id}, using default [13, 14, 15]")
+            logging.warning("No valid pitcher slots found in lineupSlotCounts for league %s, using default [13, 14, 15]", espn_league_id)
             active_pitcher_slots = [13, 14, 15]
-        logging.debug(f"Active pitcher slots for league {espn_league_id}: {active_pitcher_slots}")
+        logging.debug("Active pitcher slots for league %s: %s", espn_league_id, active_pitcher_slots)
         new_league = League(
             user_id=current_user.id,
             name=league_name,
             espn_league_id=espn_league_id,
             espn_s2='',
             swid='',
-            active_pitcher_slots=json.dumps(active_pitcher_slots)
+            active_pitcher_slots=orjson.dumps(active_pitcher_slots).decode()
         )
         new_league.set_espn_s2(espn_s2)
         new_league.set_swid(swid)
-        db.session.add(new_league)
-        max_attempts = 3
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                db.session.commit()
-                return redirect(url_for('dashboard'))
-            except OperationalError as e:
-                attempts += 1
-                logging.error(f"Database error during league linking attempt {attempts}: {str(e)}")
-                db.session.rollback()
-                if attempts < max_attempts:
-                    sleep(2)
-        flash("Error linking league due to database issues. Please try again later.", "error")
-        return render_template('link_league.html', form=form)
+        try:
+            commit_with_retry(lambda: db.session.add(new_league), "league linking")
+        except OperationalError:
+            flash("Error linking league due to database issues. Please try again later.", "error")
+            return render_template('link_league.html', form=form)
+        cache.delete_memoized(get_user_leagues, current_user.id)
+        return redirect(url_for('dashboard'))
     return render_template('link_league.html', form=form)
 
 @app.route('/create-contest', methods=['GET', 'POST'])
 @login_required
 def create_contest():
-    if not current_user.leagues:
+    # Choices only need ids and names, so use the cached rows instead of loading every League with its credentials
+    leagues = get_user_leagues(current_user.id)
+    if not leagues:
         return redirect(url_for('link_league'))
     form = ContestForm()
-    form.league_id.choices = [(l.id, l.name) for l in current_user.leagues]
+    form.league_id.choices = [(league['id'], league['name']) for league in leagues]
     if form.validate_on_submit():
         if form.start_date.data >= form.end_date.data:
             flash("Start date must be before end date.")
-            return render_template('create_contest.html', form=form, current_date=date.today().strftime('%Y-%m-%d'), start_of_month=date.today().replace(day=1).strftime('%Y-%m-%d'), leagues=current_user.leagues)
+            return render_template('create_contest.html', form=form, current_date=date.today().strftime('%Y-%m-%d'), start_of_month=date.today().replace(day=1).strftime('%Y-%m-%d'), leagues=leagues)
         contest = Contest(
             user_id=current_user.id,
             league_id=form.league_id.data,
@@ -980,77 +995,57 @@ def create_contest():
             end_date=form.end_date.data.strftime('%Y-%m-%d'),
             title=form.title.data
         )
-        db.session.add(contest)
-        max_attempts = 3
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                db.session.commit()
-                break
-            except OperationalError as e:
-                attempts += 1
-                logging.error(f"Database error during contest creation attempt {attempts}: {str(e)}")
-                db.session.rollback()
-                if attempts < max_attempts:
-                    sleep(2)
-        if attempts >= max_attempts:
+        try:
+            commit_with_retry(lambda: db.session.add(contest), "contest creation")
+        except OperationalError:
             flash("Error creating contest due to database issues. Please try again later.", "error")
-            return render_template('create_contest.html', form=form, current_date=date.today().strftime('%Y-%m-%d'), start_of_month=date.today().replace(day=1).strftime('%Y-%m-%d'), leagues=current_user.leagues)
+            return render_template('create_contest.html', form=form, current_date=date.today().strftime('%Y-%m-%d'), start_of_month=date.today().replace(day=1).strftime('%Y-%m-%d'), leagues=leagues)
 
         start_date = date.fromisoformat(contest.start_date)
         if start_date <= date.today():
-            max_attempts = 3
-            attempts = 0
-            while attempts < max_attempts:
-                try:
-                    rankings, chart_data, warning_message, status = compute_contest_stats(contest.id)
-                    new_result = ContestResult(
-                        contest_id=contest.id,
-                        rankings=json.dumps(rankings),
-                        chart_data=json.dumps(chart_data),
-                        warning_message=warning_message,
-                        status=json.dumps(status),
-                        last_updated=datetime.now(timezone.utc)
-                    )
-                    db.session.add(new_result)
-                    db.session.commit()
-                    logging.debug(f"Stored initial ContestResult for new contest {contest.id}")
-                    break
-                except (ValueError, OperationalError) as e:
-                    attempts += 1
-                    logging.error(f"Error during contest stats computation attempt {attempts}: {str(e)}")
-                    db.session.rollback()
-                    if attempts < max_attempts:
-                        sleep(2)
-            if attempts >= max_attempts:
+            contest_id = contest.id
+            # ValueError covers ESPN/MLB API failures inside compute_contest_stats, which are worth one more try too
+            try:
+                commit_with_retry(lambda: db.session.execute(insert(ContestResult).values(**contest_result_row(contest_id, *compute_contest_stats(contest_id)))), "contest stats computation", retry_on=(ValueError, OperationalError))
+                logging.debug("Stored initial ContestResult for new contest %s", contest_id)
+            except (ValueError, OperationalError):
                 flash("Error computing contest stats due to database or API issues. Contest created but results not available.", "error")
 
         return redirect(url_for('results', contest_id=contest.id))
     today = date.today()
-    return render_template('create_contest.html', form=form, current_date=today.strftime('%Y-%m-%d'), start_of_month=date.today().replace(day=1).strftime('%Y-%m-%d'), leagues=current_user.leagues)
+    return render_template('create_contest.html', form=form, current_date=today.strftime('%Y-%m-%d'), start_of_month=date.today().replace(day=1).strftime('%Y-%m-%d'), leagues=leagues)
 
 @app.route('/dashboard', methods=['GET', 'POST'])
 @login_required
 def dashboard():
-    if not current_user.leagues:
+    if not get_user_leagues(current_user.id):
         return redirect(url_for('link_league'))
     contests = Contest.query.filter_by(user_id=current_user.id).order_by(Contest.created_at.desc()).all()
-    contest_data = []
-    for contest in contests:
+    # Contests are independent, so load them concurrently; flashing and redirects stay on the request thread
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(load_contest_data, [contest.id for contest in contests]))
+    # Every recomputed contest is stored in one bulk insert, before any early redirect below can drop them
+    pending_results = [row for _, _, rows in outcomes for row in rows]
+    if pending_results:
         try:
-            rankings, chart_data, warning_message, status = get_contest_data(contest.id)
-            contest_data.append({
-                'contest': contest,
-                'chart_data': chart_data,
-                'warning_message': warning_message,
-                'status': status
-            })
-        except InvalidToken:
+            store_contest_results(pending_results)
+        except OperationalError:
+            logging.error("Failed to store %s recomputed contest results", len(pending_results))
+    contest_data = []
+    for contest, (data, error, _) in zip(contests, outcomes):
+        if isinstance(error, InvalidToken):
             flash("Encryption key mismatch detected. Clearing old leagues and please link again.", "error")
             return redirect(url_for('clear_leagues'))
-        except ValueError as e:
-            flash(str(e), "error")
+        if error:
+            flash(str(error), "error")
             continue
+        rankings, chart_data, warning_message, status = data
+        contest_data.append({
+            'contest': contest,
+            'chart_data': chart_data,
+            'warning_message': warning_message,
+            'status': status
+        })
     return render_template('dashboard.html', contest_data=contest_data)
 
 @app.route('/results/<int:contest_id>')
@@ -1068,7 +1063,185 @@ def results(contest_id):
     except ValueError as e:
         return str(e)
 
-    return render_template('results.html', rankings=rankings, stat_category=contest.stat_category, contest=contest, chart_data=chart_data, warning_message=warning_message, status=status)
+    return render_results_html(contest, rankings, chart_data, warning_message, status)
+
+def render_results_html(contest, rankings, chart_data, warning_message, status, snapshot=False):
+    # snapshot=True is the in-process render fed to the headless browser; it leaves the user's flashed messages alone
+    return render_template('results.html', rankings=rankings, stat_category=contest.stat_category, contest=contest, chart_data=chart_data, warning_message=warning_message, status=status, snapshot=snapshot)
+
+# Sync Playwright objects only work on the thread that created them, so the browser pool is a set of
+# worker threads that each own one long-lived Chromium; every snapshot gets a fresh context on one of them
+SNAPSHOT_BROWSERS = int(os.getenv('SNAPSHOT_BROWSERS', max(1, (os.cpu_count() or 2) // 2)))
+snapshot_executor = ThreadPoolExecutor(max_workers=SNAPSHOT_BROWSERS, thread_name_prefix='snapshot')
+snapshot_browser = threading.local()
+SNAPSHOT_BROWSER_ARGS = [
+    '--disable-gpu', '--disable-dev-shm-usage', '--disable-extensions', '--disable-background-networking',
+    '--disable-sync', '--disable-translate', '--no-first-run', '--mute-audio',
+    '--disable-features=Translate,BackForwardCache', '--hide-scrollbars'
+]
+# CDN host the results page loads Bootstrap and Chart.js from; every other request is blocked
+SNAPSHOT_ALLOWED_HOSTS = {'cdn.jsdelivr.net'}
+
+def get_snapshot_browser():
+    # Only called on snapshot threads; launches this thread's browser on first use and relaunches it if Chromium has exited
+    browser = getattr(snapshot_browser, 'browser', None)
+    if browser is None or not browser.is_connected():
+        if not hasattr(snapshot_browser, 'playwright'):
+            snapshot_browser.playwright = sync_playwright().start()
+        browser = snapshot_browser.playwright.chromium.launch(headless=True, args=SNAPSHOT_BROWSER_ARGS)
+        snapshot_browser.browser = browser
+        logging.info("Launched snapshot browser on %s", threading.current_thread().name)
+    return browser
+
+def render_snapshot(results_html, scale=2, image_format='jpeg'):
+    # Returns image bytes (JPEG or PNG) of #snapshot-area, or None if it never became visible
+    context = get_snapshot_browser().new_context(
+        viewport={'width': 1280, 'height': 720},
+        device_scale_factor=scale
+    )
+    try:
+        context.route("**/*", lambda route: route.continue_() if urllib.parse.urlparse(route.request.url).hostname in SNAPSHOT_ALLOWED_HOSTS else route.abort())
+        page = context.new_page()
+
+        # Load the already-rendered results page directly; no request back into the app
+        page.set_content(results_html, wait_until="domcontentloaded", timeout=15000)
+
+        # Wait for the snapshot area, then for the chart's first animation to finish (results.html sets window.chartRendered);
+        # #rankingsChart is rendered inside the snapshot area in the same response
+        try:
+            page.wait_for_selector('#snapshot-area', timeout=60000)  # Increased to 60 seconds
+            page.wait_for_function("window.chartRendered === true", timeout=10000)
+        except Exception as e:
+            logging.warning("Chart loading warning: %s. Proceeding with screenshot.", e)
+
+        # Debug: Capture full page screenshot
+        if app.config['SCREENSHOT_DEBUG']:
+            debug_path = os.path.join(os.path.dirname(__file__), 'debug_full_page.png')
+            page.screenshot(path=debug_path)
+            logging.debug("Saved debug screenshot to %s", debug_path)
+
+        # Measure #snapshot-area in one round trip, after two animation frames so layout has settled;
+        # the clip for the DevTools capture is in document coordinates
+        box = page.evaluate("""() => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(() => {
+            const el = document.getElementById('snapshot-area');
+            if (!el || getComputedStyle(el).visibility === 'hidden') return resolve(null);
+            const rect = el.getBoundingClientRect();
+            if (!rect.width || !rect.height) return resolve(null);
+            resolve({x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height});
+        }))))""")
+        if box is None:
+            logging.error("Snapshot area not visible on the page")
+            return None
+
+        cdp = context.new_cdp_session(page)
+        try:
+            params = {
+                "format": image_format,
+                "clip": {"x": box['x'], "y": box['y'], "width": box['width'], "height": box['height'], "scale": 1},
+                "captureBeyondViewport": True
+            }
+            if image_format == 'jpeg':
+                params["quality"] = 85
+            result = cdp.send("Page.captureScreenshot", params)
+        finally:
+            cdp.detach()
+        return base64.b64decode(result['data'])
+    finally:
+        context.close()
+
+def snapshot_options():
+    # Retina output by default; ?scale=1 renders at half the resolution for a quarter of the encode work
+    scale = 1 if request.args.get('scale') == '1' else 2
+    # JPEG skips PNG's deflate pass and is a fraction of the size; PNG only when the client asks for it
+    if request.args.get('format') == 'png' or request.accept_mimetypes.best_match(['image/jpeg', 'image/png']) == 'image/png':
+        return scale, 'png', 'png'
+    return scale, 'jpeg', 'jpg'
+
+SNAPSHOT_CACHE_TIMEOUT = 3600
+
+def snapshot_cache_key(contest_id, scale, image_format):
+    # Versioned by the newest stored result, so a recompute moves snapshots to a fresh key without an explicit delete
+    version = db.session.query(func.max(ContestResult.last_updated)).filter_by(contest_id=contest_id).scalar()
+    return f"snapshot:{contest_id}:{version.timestamp() if version else 0}:{scale}:{image_format}"
+
+# Queued snapshot jobs live in the shared cache so any worker process can answer the status poll
+SNAPSHOT_JOB_TIMEOUT = 300
+
+def snapshot_job_key(job_id):
+    return f"snapshot_job:{job_id}"
+
+def run_snapshot_job(job_id, job, results_html, scale, image_format, snapshot_key):
+    # Runs on a snapshot thread; stores the finished job, image bytes included, back under its key
+    with app.app_context():
+        try:
+            screenshot_bytes = render_snapshot(results_html, scale, image_format)
+            if screenshot_bytes is None:
+                job.update(status='error', message="Error generating snapshot: Content area not visible.")
+            else:
+                job.update(status='done', image=screenshot_bytes)
+                cache.set(snapshot_key, screenshot_bytes, timeout=SNAPSHOT_CACHE_TIMEOUT)
+        except Exception as e:
+            logging.error("Error generating screenshot for job %s: %s", job_id, e)
+            job.update(status='error', message="Error generating snapshot. Please try again later.")
+        cache.set(snapshot_job_key(job_id), job, timeout=SNAPSHOT_JOB_TIMEOUT)
+
+@app.route('/download_snapshot/<int:contest_id>', methods=['POST'])
+@login_required
+def queue_snapshot(contest_id):
+    # Same checks as the GET download, but answers 202 straight away and leaves the render to a snapshot thread
+    contest = db.session.get(Contest, contest_id)
+    if not contest or contest.user_id != current_user.id:
+        return {'status': 'error', 'message': "Contest not found or you don't have access."}, 404
+
+    try:
+        rankings, chart_data, warning_message, status = get_contest_data(contest_id)
+    except InvalidToken:
+        return {'status': 'error', 'message': "Encryption key mismatch detected. Clear your leagues and link them again."}, 409
+    except ValueError as e:
+        return {'status': 'error', 'message': str(e)}, 400
+
+    if not status['is_started']:
+        return {'status': 'error', 'message': "Cannot generate snapshot: Contest has not started yet."}, 409
+
+    scale, image_format, extension = snapshot_options()
+    snapshot_key = snapshot_cache_key(contest_id, scale, image_format)
+    job_id = uuid.uuid4().hex
+    job = {
+        'user_id': current_user.id,
+        'status': 'pending',
+        'mimetype': f'image/{image_format}',
+        'filename': f"contest_{contest_id}_results.{extension}"
+    }
+    screenshot_bytes = cache.get(snapshot_key)
+    if screenshot_bytes is not None:
+        # Results haven't changed since the last render; the job is finished before it starts
+        job.update(status='done', image=screenshot_bytes)
+        cache.set(snapshot_job_key(job_id), job, timeout=SNAPSHOT_JOB_TIMEOUT)
+    else:
+        results_html = render_results_html(contest, rankings, chart_data, warning_message, status, snapshot=True)
+        cache.set(snapshot_job_key(job_id), job, timeout=SNAPSHOT_JOB_TIMEOUT)
+        snapshot_executor.submit(run_snapshot_job, job_id, dict(job), results_html, scale, image_format, snapshot_key)
+    status_url = url_for('snapshot_job_status', job_id=job_id)
+    return {'job_id': job_id, 'status_url': status_url}, 202, {'Location': status_url}
+
+@app.route('/snapshot-jobs/<job_id>')
+@login_required
+def snapshot_job_status(job_id):
+    # 202 while the render is pending, then the image itself
+    job = cache.get(snapshot_job_key(job_id))
+    if not job or job['user_id'] != current_user.id:
+        return {'status': 'error', 'message': "Snapshot not found or expired."}, 404
+    if job['status'] == 'pending':
+        return {'status': 'pending'}, 202, {'Retry-After': '1'}
+    if job['status'] == 'error':
+        return {'status': 'error', 'message': job['message']}, 500
+    return send_file(
+        io.BytesIO(job['image']),
+        mimetype=job['mimetype'],
+        as_attachment=True,
+        download_name=job['filename'],
+        max_age=0
+    )
 
 @app.route('/download_snapshot/<int:contest_id>')
 @login_required
@@ -1087,140 +1260,102 @@ def download_snapshot(contest_id):
         flash(str(e), "error")
         return redirect(url_for('dashboard'))
 
-    # Generate screenshot using Playwright
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                device_scale_factor=2
-            )
-            page = context.new_page()
-
-            # Set cookies to maintain session
-            session_cookie = {
-                'name': 'session',
-                'value': request.cookies.get('session'),
-                'domain': request.host,  # Use the current host (localhost locally, Render domain on server)
-                'path': '/',
-                'secure': False
-            }
-            context.add_cookies([session_cookie])
-            logging.debug(f"Set session cookie: {session_cookie}")
-
-            # Navigate to the results page
-            results_url = url_for('results', contest_id=contest_id, _external=True)
-            logging.debug(f"Navigating to results URL: {results_url}")
-            page.goto(results_url)
-
-            # Check if contest has started
-            if not status['is_started']:
-                logging.warning("Contest not started, no snapshot area available")
-                flash("Cannot generate snapshot: Contest has not started yet.", "error")
-                browser.close()
-                return redirect(url_for('results', contest_id=contest_id))
-
-            # Wait for the snapshot area with a longer timeout
-            try:
-                page.wait_for_selector('#snapshot-area', timeout=60000)  # Increased to 60 seconds
-                page.wait_for_selector('#rankingsChart', timeout=60000)
-                page.wait_for_timeout(2000)  # Extra wait for chart rendering
-            except Exception as e:
-                logging.warning(f"Chart loading warning: {str(e)}. Proceeding with screenshot.")
-
-            # Debug: Capture full page screenshot
-            debug_path = os.path.join(os.path.dirname(__file__), 'debug_full_page.png')
-            page.screenshot(path=debug_path)
-            logging.debug(f"Saved debug screenshot to {debug_path}")
-
-            # Capture the snapshot-area div
-            snapshot_area = page.locator('#snapshot-area')
-            if not snapshot_area.is_visible():
-                logging.error("Snapshot area not visible on the page")
-                flash("Error generating snapshot: Content area not visible.", "error")
-                browser.close()
-                return redirect(url_for('results', contest_id=contest_id))
-
-            # Take screenshot
-            screenshot_bytes = snapshot_area.screenshot()
-
-            browser.close()
-
-            # Serve the screenshot
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            temp_file.write(screenshot_bytes)
-            temp_file.close()
-
-            filename = f"contest_{contest_id}_results.png"
-            return send_file(
-                temp_file.name,
-                mimetype='image/png',
-                as_attachment=True,
-                download_name=filename
-            )
+    if not status['is_started']:
+        logging.warning("Contest not started, no snapshot area available")
+        flash("Cannot generate snapshot: Contest has not started yet.", "error")
+        return redirect(url_for('results', contest_id=contest_id))
 
+    scale, image_format, extension = snapshot_options()
+    snapshot_key = snapshot_cache_key(contest_id, scale, image_format)
+    screenshot_bytes = cache.get(snapshot_key)
+    if screenshot_bytes is None:
+        results_html = render_results_html(contest, rankings, chart_data, warning_message, status, snapshot=True)
+        try:
+            screenshot_bytes = snapshot_executor.submit(render_snapshot, results_html, scale, image_format).result()
         except Exception as e:
-            logging.error(f"Error generating screenshot for contest {contest_id}: {str(e)}")
+            logging.error("Error generating screenshot for contest %s: %s", contest_id, e)
             flash("Error generating snapshot. Please try again later.", "error")
-            if 'browser' in locals():
-                browser.close()
             return redirect(url_for('results', contest_id=contest_id))
+        if screenshot_bytes is None:
+            flash("Error generating snapshot: Content area not visible.", "error")
+            return redirect(url_for('results', contest_id=contest_id))
+        cache.set(snapshot_key, screenshot_bytes, timeout=SNAPSHOT_CACHE_TIMEOUT)
+    else:
+        logging.debug("Serving cached snapshot for contest %s", contest_id)
+
+    # Serve the screenshot
+    filename = f"contest_{contest_id}_results.{extension}"
+    return send_file(
+        io.BytesIO(screenshot_bytes),
+        mimetype=f'image/{image_format}',
+        as_attachment=True,
+        download_name=filename,
+        max_age=0
+    )
 
 @app.route('/delete-contest/<int:contest_id>', methods=['POST'])
 @login_required
 def delete_contest(contest_id):
     contest = db.session.get(Contest, contest_id)
     if contest and contest.user_id == current_user.id:
-        ContestResult.query.filter_by(contest_id=contest_id).delete()
-        db.session.delete(contest)
-        max_attempts = 3
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                db.session.commit()
-                cache.delete_memoized(compute_contest_stats, contest_id)
-                flash("Contest deleted successfully.", "success")
-                return redirect(url_for('dashboard'))
-            except OperationalError as e:
-                attempts += 1
-                logging.error(f"Database error during contest deletion attempt {attempts}: {str(e)}")
-                db.session.rollback()
-                if attempts < max_attempts:
-                    sleep(2)
-        flash("Error deleting contest due to database issues. Please try again later.", "error")
+        invalidate_contest(contest_id)
+        def delete_rows():
+            ContestResult.query.filter_by(contest_id=contest_id).delete()
+            db.session.delete(contest)
+        try:
+            commit_with_retry(delete_rows, "contest deletion")
+            flash("Contest deleted successfully.", "success")
+        except OperationalError:
+            flash("Error deleting contest due to database issues. Please try again later.", "error")
     else:
         flash("Contest not found or you don't have permission to delete it.", "error")
     return redirect(url_for('dashboard'))
 
+@app.route('/refresh-contest/<int:contest_id>', methods=['POST'])
+@login_required
+def refresh_contest(contest_id):
+    contest = db.session.get(Contest, contest_id)
+    if contest and contest.user_id == current_user.id:
+        # Wait for the purge: the dashboard this redirects to would otherwise reuse the stale memoized stats and store them as today's result
+        invalidate_contest(contest_id).result()
+        try:
+            commit_with_retry(lambda: ContestResult.query.filter_by(contest_id=contest_id).delete(), "contest refresh")
+            flash("Contest stats refreshed.", "success")
+        except OperationalError:
+            flash("Error refreshing contest due to database issues. Please try again later.", "error")
+    else:
+        flash("Contest not found or you don't have permission to refresh it.", "error")
+    return redirect(url_for('dashboard'))
+
 @app.route('/clear-contests')
 @login_required
 def clear_contests():
-    ContestResult.query.filter(ContestResult.contest_id.in_([c.id for c in current_user.contests])).delete()
-    Contest.query.filter_by(user_id=current_user.id).delete()
-    max_attempts = 3
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            db.session.commit()
-            cache.clear()
-            flash("All contests cleared successfully.", "success")
-            return redirect(url_for('dashboard'))
-        except OperationalError as e:
-            attempts += 1
-            logging.error(f"Database error during contests clearing attempt {attempts}: {str(e)}")
-            db.session.rollback()
-            if attempts < max_attempts:
-                sleep(2)
-    flash("Error clearing contests due to database issues. Please try again later.", "error")
+    def delete_rows():
+        ContestResult.query.filter(ContestResult.contest_id.in_(db.session.query(Contest.id).filter(Contest.user_id == current_user.id))).delete(synchronize_session=False)
+        Contest.query.filter_by(user_id=current_user.id).delete(synchronize_session=False)
+    try:
+        commit_with_retry(delete_rows, "contests clearing")
+    except OperationalError:
+        flash("Error clearing contests due to database issues. Please try again later.", "error")
+        return redirect(url_for('dashboard'))
+    cache.clear()
+    flash("All contests cleared successfully.", "success")
     return redirect(url_for('dashboard'))
 
+# Plain dicts so the cached value doesn't hold detached ORM instances
+@cache.memoize(timeout=300)
+def get_user_leagues(user_id):
+    return [
+        {'id': league_id, 'name': name, 'espn_league_id': espn_league_id}
+        for league_id, name, espn_league_id in db.session.query(League.id, League.name, League.espn_league_id).filter_by(user_id=user_id).order_by(League.id)
+    ]
+
 @app.route('/my-leagues', methods=['GET', 'POST'])
 @login_required
 def my_leagues():
-    leagues = current_user.leagues
-    forms = [DeleteLeagueForm(prefix=str(league.id), league_id=league.id) for league in leagues]
+    leagues = get_user_leagues(current_user.id)
     if request.method == 'POST':
-        logging.debug(f"Received POST request to /my-leagues with form data: {request.form}")
+        logging.debug("Received POST request to /my-leagues with form data: %s", request.form)
         submitted_prefix = None
         for key in request.form.keys():
             if key.endswith('-league_id'):
@@ -1234,91 +1369,86 @@ def my_leagues():
 
         league_id_values = request.form.getlist(f"{submitted_prefix}-league_id")
         if not league_id_values:
-            logging.warning(f"No league_id value provided for prefix {submitted_prefix}")
+            logging.warning("No league_id value provided for prefix %s", submitted_prefix)
             flash("No league selected for deletion.", "error")
             return redirect(url_for('my_leagues'))
         submitted_league_id = league_id_values[0]
 
-        for form in forms:
-            logging.debug(f"Checking form with prefix: {form._prefix}, submitted_prefix: {submitted_prefix}")
-            if form._prefix.rstrip('-') == submitted_prefix:
-                form.process(formdata=request.form)
-                if form.validate():
-                    logging.debug(f"Form validated successfully, league_id: {form.league_id.data}")
-                    max_attempts = 3
-                    attempts = 0
-                    while attempts < max_attempts:
-                        try:
-                            league_id = int(form.league_id.data)
-                            league = db.session.get(League, league_id)
-                            if league and league.user_id == current_user.id:
-                                logging.debug(f"Found league {league_id} for user {current_user.id}, deleting...")
-                                ContestResult.query.filter(ContestResult.contest_id.in_([c.id for c in league.contests])).delete()
-                                Contest.query.filter_by(league_id=league.id).delete()
-                                db.session.delete(league)
-                                db.session.commit()
-                                cache.clear()
-                                flash("League deleted successfully.", "success")
-                                logging.info(f"Successfully deleted league {league_id}")
-                                return redirect(url_for('my_leagues'))
-                            else:
-                                logging.warning(f"League {league_id} not found or user {current_user.id} lacks permission")
-                                flash("League not found or you don't have permission to delete it.", "error")
-                                return redirect(url_for('my_leagues'))
-                        except OperationalError as e:
-                            attempts += 1
-                            logging.error(f"Database error during league deletion attempt {attempts}: {str(e)}")
-                            db.session.rollback()
-                            if attempts < max_attempts:
-                                sleep(2)
-                    flash("Error deleting league due to database issues. Please try again later.", "error")
-                    return redirect(url_for('my_leagues'))
-                else:
-                    logging.warning(f"Form validation failed for league_id {form.league_id.data}: {form.errors}")
-                    flash(f"Form validation failed: {form.errors}", "error")
-                    return redirect(url_for('my_leagues'))
+        try:
+            league_id_int = int(submitted_league_id)
+        except ValueError:
+            league_id_int = None
+        if league_id_int is None or submitted_prefix != str(league_id_int) or league_id_int not in {league['id'] for league in leagues}:
+            logging.warning("No league matched submitted prefix %s", submitted_prefix)
+            flash("Invalid league selection.", "error")
+            return redirect(url_for('my_leagues'))
+
+        form = DeleteLeagueForm(prefix=submitted_prefix, formdata=request.form)
+        if form.validate():
+            logging.debug("Form validated successfully, league_id: %s", form.league_id.data)
+            league_id = int(form.league_id.data)
+            league = db.session.get(League, league_id)
+            if not league or league.user_id != current_user.id:
+                logging.warning("League %s not found or user %s lacks permission", league_id, current_user.id)
+                flash("League not found or you don't have permission to delete it.", "error")
+                return redirect(url_for('my_leagues'))
+            logging.debug("Found league %s for user %s, deleting...", league_id, current_user.id)
+            def delete_rows():
+                ContestResult.query.filter(ContestResult.contest_id.in_(db.session.query(Contest.id).filter(Contest.league_id == league_id))).delete(synchronize_session=False)
+                Contest.query.filter_by(league_id=league_id).delete(synchronize_session=False)
+                db.session.delete(league)
+            try:
+                commit_with_retry(delete_rows, "league deletion")
+            except OperationalError:
+                flash("Error deleting league due to database issues. Please try again later.", "error")
+                return redirect(url_for('my_leagues'))
+            cache.delete_memoized(get_user_leagues, current_user.id)
+            cache.clear()
+            flash("League deleted successfully.", "success")
+            logging.info("Successfully deleted league %s", league_id)
+            return redirect(url_for('my_leagues'))
+        else:
+            logging.warning("Form validation failed for league_id %s: %s", form.league_id.data, form.errors)
+            flash(f"Form validation failed: {form.errors}", "error")
+            return redirect(url_for('my_leagues'))
+
+    # Each delete form only needs its prefixed hidden fields, so skip building a FlaskForm per league
+    logging.debug("Rendering my_leagues.html with %s leagues", len(leagues))
+    return render_template('my_leagues.html', leagues=leagues, csrf_token=generate_csrf())
+
+def format_ratio_stat(value):
+    return f"{value:.4f}"
 
-        logging.warning(f"No form matched submitted prefix {submitted_prefix}")
-        flash("Invalid league selection.", "error")
-        return redirect(url_for('my_leagues'))
+def format_innings_pitched(value):
+    total_outs = round(value * 3)
+    whole = total_outs // 3
+    frac = total_outs % 3
+    return f"{whole}.{frac}"
 
-    leagues_forms = list(zip(leagues, forms))
-    logging.debug(f"Rendering my_leagues.html with {len(leagues)} leagues")
-    return render_template('my_leagues.html', leagues_forms=leagues_forms)
+def format_counting_stat(value):
+    return f"{int(value)}"
+
+STAT_FORMATTERS = dict.fromkeys(RATIO_FORMULAS, format_ratio_stat)
+STAT_FORMATTERS['INNINGS PITCHED'] = format_innings_pitched
 
 @app.template_filter('format_stat')
 def format_stat(value, category):
-    if category in ['OBP', 'AVG', 'SLUGGING PERCENTAGE', 'ERA', 'WHIP', 'K/BB']:
-        return f"{value:.4f}"
-    elif category == 'INNINGS PITCHED':
-        total_outs = round(value * 3)
-        whole = total_outs // 3
-        frac = total_outs % 3
-        return f"{whole}.{frac}"
-    else:
-        return f"{int(value)}"
+    return STAT_FORMATTERS.get(category, format_counting_stat)(value)
 
 @app.route('/clear-leagues')
 @login_required
 def clear_leagues():
-    max_attempts = 3
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            ContestResult.query.filter(ContestResult.contest_id.in_([c.id for c in current_user.contests])).delete()
-            Contest.query.filter_by(user_id=current_user.id).delete()
-            League.query.filter_by(user_id=current_user.id).delete()
-            db.session.commit()
-            cache.clear()
-            flash("All leagues cleared successfully. Please link your leagues again.", "success")
-            return redirect(url_for('link_league'))
-        except OperationalError as e:
-            attempts += 1
-            logging.error(f"Database error during leagues clearing attempt {attempts}: {str(e)}")
-            db.session.rollback()
-            if attempts < max_attempts:
-                sleep(2)
-    flash("Error clearing leagues due to database issues. Please try again later.", "error")
+    def delete_rows():
+        ContestResult.query.filter(ContestResult.contest_id.in_(db.session.query(Contest.id).filter(Contest.user_id == current_user.id))).delete(synchronize_session=False)
+        Contest.query.filter_by(user_id=current_user.id).delete(synchronize_session=False)
+        League.query.filter_by(user_id=current_user.id).delete(synchronize_session=False)
+    try:
+        commit_with_retry(delete_rows, "leagues clearing")
+    except OperationalError:
+        flash("Error clearing leagues due to database issues. Please try again later.", "error")
+        return redirect(url_for('link_league'))
+    cache.clear()
+    flash("All leagues cleared successfully. Please link your leagues again.", "success")
     return redirect(url_for('link_league'))
 
 if __name__ == '__main__':
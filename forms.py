@@ -2,6 +2,30 @@ from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, SelectField, IntegerField, HiddenField, DateField
 from wtforms.validators import DataRequired, Length, Email, EqualTo
 
+# (value, label) pairs for every supported contest category; app.py validates against the same values
+STAT_CATEGORY_CHOICES = (
+    ('OBP', 'OBP'),
+    ('HR', 'Home Runs'),
+    ('RBI', 'RBI'),
+    ('AVG', 'Batting Average'),
+    ('HITS', 'Hits'),
+    ('RUNS SCORED', 'Runs Scored'),
+    ('WALKS', 'Walks'),
+    ('STOLEN BASES', 'Stolen Bases'),
+    ('SLUGGING PERCENTAGE', 'Slugging Percentage'),
+    ('INNINGS PITCHED', 'Innings Pitched'),
+    ('HITS ALLOWED', 'Hits Allowed'),
+    ('ERA', 'ERA'),
+    ('WALKS ALLOWED', 'Walks Allowed'),
+    ('STRIKEOUTS', 'Strikeouts'),
+    ('QUALITY STARTS', 'Quality Starts'),
+    ('WINS', 'Wins'),
+    ('SAVES', 'Saves'),
+    ('SAVES + HOLDS', 'Saves + Holds'),
+    ('WHIP', 'WHIP'),
+    ('K/BB', 'K/BB')
+)
+
 class RegistrationForm(FlaskForm):
     username = StringField('Username', validators=[DataRequired(), Length(min=4, max=80)])
     email = StringField('Email', validators=[DataRequired(), Email()])
@@ -22,28 +46,7 @@ class LinkLeagueForm(FlaskForm):
 
 class ContestForm(FlaskForm):
     league_id = SelectField('Select League', coerce=int, validators=[DataRequired()])
-    stat_category = SelectField('Stat Category', choices=[
-        ('OBP', 'OBP'),
-        ('HR', 'Home Runs'),
-        ('RBI', 'RBI'),
-        ('AVG', 'Batting Average'),
-        ('HITS', 'Hits'),
-        ('RUNS SCORED', 'Runs Scored'),
-        ('WALKS', 'Walks'),
-        ('STOLEN BASES', 'Stolen Bases'),
-        ('SLUGGING PERCENTAGE', 'Slugging Percentage'),
-        ('INNINGS PITCHED', 'Innings Pitched'),
-        ('HITS ALLOWED', 'Hits Allowed'),
-        ('ERA', 'ERA'),
-        ('WALKS ALLOWED', 'Walks Allowed'),
-        ('STRIKEOUTS', 'Strikeouts'),
-        ('QUALITY STARTS', 'Quality Starts'),
-        ('WINS', 'Wins'),
-        ('SAVES', 'Saves'),
-        ('SAVES + HOLDS', 'Saves + Holds'),
-        ('WHIP', 'WHIP'),
-        ('K/BB', 'K/BB')
-    ], validators=[DataRequired()])
+    stat_category = SelectField('Stat Category', choices=STAT_CATEGORY_CHOICES, validators=[DataRequired()])
     title = StringField('Contest Title (optional)', validators=[Length(max=100)])
     start_date = DateField('Start Date', validators=[DataRequired()])
     end_date = DateField('End Date', validators=[DataRequired()])
@@ -0,0 +1,132 @@
+import logging
+from collections import defaultdict
+
+# Pure stat aggregation helpers for compute_contest_stats; no Flask, database or HTTP access in here
+
+def index_game_log(game_log):
+    # Group a season game log by game date so each contest day is a single lookup
+    by_date = defaultdict(list)
+    for split in game_log:
+        by_date[split.get('date')].append(split['stat'])
+    return dict(by_date)
+
+# Innings pitched record outs as the decimal part: .1 is one out, .2 is two
+_IP_FRAC = {'0': 0.0, '1': 1 / 3, '2': 2 / 3}
+
+def parse_ip(ip):
+    ip_str = ip if isinstance(ip, str) else str(ip)
+    dot = ip_str.rfind('.')
+    try:
+        if dot == -1:
+            return float(ip_str)
+        whole = int(ip_str[:dot])
+    except ValueError:
+        logging.warning("Error parsing innings pitched '%s'", ip_str)
+        return 0.0
+    frac = ip_str[dot + 1:]
+    if frac not in _IP_FRAC:
+        # Keep the full innings rather than dropping the whole value over an out count we don't recognise
+        logging.warning("Unexpected outs in innings pitched '%s', using %s", ip_str, whole)
+    return whole + _IP_FRAC.get(frac, 0.0)
+
+# MLB game log keys each contest category reads; only these are parsed and summed per game, so keep each
+# tuple to exactly what the category's row check and formula use
+CATEGORY_TO_MLB_KEYS = {
+    'OBP': ('hits', 'baseOnBalls', 'hitByPitch', 'atBats', 'sacFlies'),
+    'AVG': ('hits', 'atBats'),
+    'HR': ('homeRuns',),
+    'RBI': ('rbi',),
+    'HITS': ('hits',),
+    'RUNS SCORED': ('runs',),
+    'WALKS': ('baseOnBalls',),
+    'STOLEN BASES': ('stolenBases',),
+    'SLUGGING PERCENTAGE': ('totalBases', 'atBats'),
+    'INNINGS PITCHED': ('inningsPitched',),
+    'HITS ALLOWED': ('hits',),
+    'ERA': ('earnedRuns', 'inningsPitched'),
+    'WALKS ALLOWED': ('baseOnBalls',),
+    'STRIKEOUTS': ('strikeOuts',),
+    'QUALITY STARTS': ('qualityStarts',),
+    'WINS': ('wins',),
+    'SAVES': ('saves',),
+    'SAVES + HOLDS': ('saves', 'holds'),
+    'WHIP': ('hits', 'baseOnBalls', 'inningsPitched'),
+    'K/BB': ('strikeOuts', 'baseOnBalls')
+}
+STAT_PARSERS = {'inningsPitched': parse_ip}
+
+def reduce_team_totals(row_teams, row_columns, num_teams):
+    # Sum accepted rows per team, one column at a time; key_totals[k][i] is the k-th MLB key for the i-th team
+    key_totals = []
+    for column in row_columns:
+        totals = [0.0] * num_teams
+        for i, value in zip(row_teams, column):
+            totals[i] += value
+        key_totals.append(totals)
+    return key_totals
+
+# Per-row sanity checks; a row that fails is left out of the team sums
+def check_hits_row(stats, player_id):
+    h = stats.get('hits', 0)
+    ab = stats.get('atBats', 0)
+    if h > ab:
+        logging.warning("Invalid stats for player ID %s: Hits (%s) > At Bats (%s)", player_id, h, ab)
+        return False
+    return True
+
+def check_total_bases_row(stats, player_id):
+    total_bases = stats.get('totalBases', 0)
+    ab = stats.get('atBats', 0)
+    if total_bases > 4 * ab:
+        logging.warning("Invalid stats for player ID %s: Total Bases (%s) > 4 * At Bats (%s)", player_id, total_bases, ab)
+        return False
+    return True
+
+def check_era_row(stats, player_id):
+    if stats.get('inningsPitched', 0) <= 0:
+        return False
+    er = stats.get('earnedRuns', 0)
+    if er < 0:
+        logging.warning("Invalid stats for player ID %s: Earned Runs (%s) < 0", player_id, er)
+        return False
+    return True
+
+def check_whip_row(stats, player_id):
+    if stats.get('inningsPitched', 0) <= 0:
+        return False
+    hits = stats.get('hits', 0)
+    bb = stats.get('baseOnBalls', 0)
+    if hits < 0 or bb < 0:
+        logging.warning("Invalid stats for player ID %s: Hits (%s) or Walks (%s) < 0", player_id, hits, bb)
+        return False
+    return True
+
+ROW_CHECKS = {
+    'OBP': check_hits_row,
+    'AVG': check_hits_row,
+    'SLUGGING PERCENTAGE': check_total_bases_row,
+    'ERA': check_era_row,
+    'WHIP': check_whip_row
+}
+
+# Ratio categories as (numerator keys, numerator scale, denominator keys) over a team's summed MLB keys; every other category is the plain sum
+RATIO_FORMULAS = {
+    'OBP': (('hits', 'baseOnBalls', 'hitByPitch'), 1, ('atBats', 'baseOnBalls', 'hitByPitch', 'sacFlies')),
+    'AVG': (('hits',), 1, ('atBats',)),
+    'SLUGGING PERCENTAGE': (('totalBases',), 1, ('atBats',)),
+    'ERA': (('earnedRuns',), 9, ('inningsPitched',)),
+    'WHIP': (('hits', 'baseOnBalls'), 1, ('inningsPitched',)),
+    'K/BB': (('strikeOuts',), 1, ('baseOnBalls',))
+}
+
+def team_values(stat_category, mlb_keys, key_totals):
+    # Every team's value in one pass over the summed columns; nums/dens are None for counting categories
+    formula = RATIO_FORMULAS.get(stat_category)
+    if not formula:
+        return None, None, list(map(sum, zip(*key_totals)))
+    columns = dict(zip(mlb_keys, key_totals))
+    num_keys, num_scale, den_keys = formula
+    nums = [num_scale * n for n in map(sum, zip(*(columns[key] for key in num_keys)))]
+    dens = list(map(sum, zip(*(columns[key] for key in den_keys))))
+    values = [num / den if den > 0 else 999.0 if num > 0 else 0.0 for num, den in zip(nums, dens)]
+    return nums, dens, values
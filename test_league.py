@@ -8,19 +8,23 @@ league = League(
     swid='{B0667B75-1C17-4493-9E8F-BB24C3066905}'
 )
 
-# Print all teams in the league
-print("Teams in League ID 3438:")
+# League() loads teams, owners and rosters in its initial requests, so one pass over the local data covers both sections
+team_lines = []
+roster_lines = []
 for team in league.teams:
     if team.owners:
         owner_names = [owner.get('displayName', 'Unknown') for owner in team.owners]
     else:
         owner_names = ['Unknown']
     owner = ', '.join(owner_names)
-    print(f"- {team.team_name} (Owner: {owner})")
+    team_lines.append(f"- {team.team_name} (Owner: {owner})")
+    roster_lines.append(f"\nTeam: {team.team_name}")
+    roster_lines.extend(f"  - {player.name} ({player.position})" for player in team.roster)
+
+# Print all teams in the league
+print("Teams in League ID 3438:")
+print('\n'.join(team_lines))
 
 # Print rosters for each team
 print("\nRosters:")
-for team in league.teams:
-    print(f"\nTeam: {team.team_name}")
-    for player in team.roster:
-        print(f"  - {player.name} ({player.position})")
+print('\n'.join(roster_lines))
\ No newline at end of file
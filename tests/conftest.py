@@ -0,0 +1,22 @@
+import base64
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app.py configures itself from the environment at import time, so point it at a throwaway database first
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db'))
+os.environ.setdefault('ENCRYPTION_KEY', base64.urlsafe_b64encode(os.urandom(32)).decode())
+os.environ.setdefault('YEAR', '2025')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app_module():
+    import app as app_module
+    with app_module.app.app_context():
+        app_module.db.drop_all()
+        app_module.db.create_all()
+        yield app_module
+        app_module.db.session.remove()
@@ -0,0 +1,78 @@
+from datetime import date
+
+import pytest
+
+
+def roster_entry(player_id, name, slot):
+    return {'playerId': player_id, 'lineupSlotId': slot, 'playerPoolEntry': {'player': {'fullName': name}}}
+
+
+def roster_team(team_id, entries):
+    return {'id': team_id, 'roster': {'entries': entries}}
+
+
+@pytest.fixture
+def league(app_module, monkeypatch):
+    a = app_module
+    day1, day2 = date(a.YEAR, 4, 1), date(a.YEAR, 4, 2)
+    # Player 101 hits from the UTIL slot on day 1 and pitches on day 2, so hitting and pitching contests both need him
+    rosters = {
+        day1: [roster_team(1, [roster_entry(101, 'Two Way', 12)]), roster_team(2, [roster_entry(102, 'Hitter', 0)])],
+        day2: [roster_team(1, [roster_entry(101, 'Two Way', 13)]), roster_team(2, [roster_entry(102, 'Hitter', 0)])],
+    }
+    game_logs = {
+        ('hitting', 9101): [{'date': day1.isoformat(), 'stat': {'hits': 2, 'atBats': 4}}],
+        ('pitching', 9101): [{'date': day2.isoformat(), 'stat': {'hits': 7, 'earnedRuns': 3, 'inningsPitched': '6.0', 'baseOnBalls': 1}}],
+        ('hitting', 9102): [{'date': day1.isoformat(), 'stat': {'hits': 1, 'atBats': 3}}, {'date': day2.isoformat(), 'stat': {'hits': 2, 'atBats': 4}}],
+        ('pitching', 9102): [],
+    }
+    monkeypatch.setattr(a, 'get_team_names', lambda league_id, cookies: {1: 'Alpha', 2: 'Beta'})
+    monkeypatch.setattr(a, 'get_team_rosters', lambda league_id, cookies, start_date, end_date, season_start: rosters)
+    monkeypatch.setattr(a, 'fetch_mlb_id', {'Two Way': 9101, 'Hitter': 9102}.get)
+    monkeypatch.setattr(a, 'fetch_game_log', lambda mlb_id, group: {'stats': [{'splits': game_logs[(group, mlb_id)]}]})
+
+    user = a.User(username='tester', email='tester@example.com', password_hash='x')
+    a.db.session.add(user)
+    a.db.session.flush()
+    league = a.League(user_id=user.id, name='Test League', espn_league_id=1, espn_s2='', swid='', active_pitcher_slots='[13, 14, 15]')
+    league.set_espn_s2('s2')
+    league.set_swid('swid')
+    a.db.session.add(league)
+    a.db.session.commit()
+    return league
+
+
+def compute(app_module, league, stat_category):
+    a = app_module
+    contest = a.Contest(user_id=league.user_id, league_id=league.id, stat_category=stat_category, start_date=f'{a.YEAR}-04-01', end_date=f'{a.YEAR}-04-02')
+    a.db.session.add(contest)
+    a.db.session.commit()
+    rankings, _, _, _ = a.compute_contest_stats.uncached(contest.id)
+    return dict(rankings)
+
+
+def test_hitting_totals_survive_a_pitching_contest_on_the_same_players(app_module, league):
+    assert compute(app_module, league, 'HITS') == {'Alpha': 2, 'Beta': 3}
+    assert compute(app_module, league, 'ERA')['Alpha'] == pytest.approx(4.5)
+    assert compute(app_module, league, 'HITS') == {'Alpha': 2, 'Beta': 3}
+
+    # Each stored row is labelled with the group its game log came from
+    rows = {row.espn_id: row for row in app_module.PlayerCache.query.all()}
+    assert rows[101].group == 'hitting' and rows[101].season == app_module.YEAR
+    assert '"earnedRuns"' not in rows[101].game_log
+
+
+def test_mlb_id_lookup_updates_a_prior_season_row(app_module, monkeypatch):
+    a = app_module
+    a.db.session.add(a.PlayerCache(espn_id=201, player_name='Veteran', mlb_id=None, season=a.YEAR - 1, group='hitting', game_log='[]'))
+    a.db.session.commit()
+    lookups = []
+    monkeypatch.setattr(a, 'fetch_mlb_id', lambda name: lookups.append(name) or 9201)
+
+    assert a.get_mlb_ids({201: 'Veteran'}, 'hitting') == {201: 9201}
+    assert a.get_mlb_ids({201: 'Veteran'}, 'hitting') == {201: 9201}
+
+    # The second call is served from the relabelled row, and last season's game log is not carried over
+    assert lookups == ['Veteran']
+    row = a.PlayerCache.query.filter_by(espn_id=201).one()
+    assert (row.season, row.mlb_id, row.game_log) == (a.YEAR, 9201, None)
@@ -0,0 +1,23 @@
+import pytest
+
+from stats_core import parse_ip
+
+
+@pytest.mark.parametrize('ip, expected', [
+    ('6.0', 6.0),
+    ('6.1', 6 + 1 / 3),
+    ('6.2', 6 + 2 / 3),
+    ('6', 6.0),
+    (6.1, 6 + 1 / 3),
+])
+def test_parse_ip_reads_outs_as_thirds(ip, expected):
+    assert parse_ip(ip) == pytest.approx(expected)
+
+
+def test_parse_ip_keeps_whole_innings_for_unknown_outs():
+    assert parse_ip('5.3') == 5.0
+
+
+def test_parse_ip_malformed_is_zero():
+    assert parse_ip('abc') == 0.0
+    assert parse_ip('x.1') == 0.0